@@ -41,7 +41,7 @@ function getStatusBadge(status: string) {
     return "bg-yellow-100 text-yellow-800 border-yellow-200";
   } else if (statusLower.includes('not_submitted')) {
     return "bg-slate-100 text-slate-600 border-slate-200";
-  } else if (statusLower.includes('uploaded')) {
+  } else if (statusLower.includes('uploaded') || statusLower.includes('submitting')) {
     return "bg-blue-50 text-blue-600 border-blue-200";
   } else {
     return "bg-gray-100 text-gray-600 border-gray-200";
@@ -65,7 +65,7 @@ const transformJobSummary = (job: JobSummary): JobRun => {
     progress = 10;
   } else if (statusLower === 'not_submitted') {
     progress = 0;
-  } else if (statusLower === 'uploaded') {
+  } else if (statusLower === 'uploaded' || statusLower === 'submitting') {
     progress = 5;
   }
 
@@ -80,7 +80,7 @@ const transformJobSummary = (job: JobSummary): JobRun => {
     estimatedTime = "Queued";
   } else if (statusLower === 'not_submitted') {
     estimatedTime = "Awaiting Upload";
-  } else if (statusLower === 'uploaded') {
+  } else if (statusLower === 'uploaded' || statusLower === 'submitting') {
     estimatedTime = "Ready to Process";
   } else {
     estimatedTime = "Unknown";
@@ -17,9 +17,10 @@ interface ActivityEntry {
 
 interface ActivitiesResponse {
   logs: ActivityEntry[];
-  total: number;
+  total: number | null;
   limit: number;
   offset: number;
+  has_more: boolean;
 }
 
 function getActivityBadge(activityType: string) {
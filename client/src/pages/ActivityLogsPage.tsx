@@ -43,6 +43,8 @@ async function fetchActivities(params?: {
   if (params?.activity_type && params.activity_type !== 'all') searchParams.set('activity_type', params.activity_type);
   if (params?.user && params.user !== 'all') searchParams.set('user', params.user);
   if (params?.search) searchParams.set('search', params.search);
+  // The activity count is only computed on request
+  searchParams.set('include_total', 'true');
 
   const url = `/api/logs${searchParams.toString() ? '?' + searchParams.toString() : ''}`;
   const response = await fetch(url);
@@ -94,6 +94,7 @@ export function JobDetailsPage({ jobId, onPageChange }: JobDetailsPageProps) {
         return <Clock className="h-5 w-5 text-yellow-600" />;
       case 'not_submitted':
         return <AlertCircle className="h-5 w-5 text-gray-500" />;
+      case 'submitting':
       case 'uploaded':
         return <AlertCircle className="h-5 w-5 text-blue-600" />;
       default:
@@ -113,6 +114,7 @@ export function JobDetailsPage({ jobId, onPageChange }: JobDetailsPageProps) {
         return 'secondary';
       case 'not_submitted':
         return 'outline';
+      case 'submitting':
       case 'uploaded':
         return 'secondary';
       default:
@@ -29,6 +29,7 @@ export function ResultsPage({ onPageChange }: ResultsPageProps = {}) {
         return <Clock className="h-5 w-5 text-warning" />;
       case 'not_submitted':
         return <AlertCircle className="h-5 w-5 text-muted-foreground" />;
+      case 'submitting':
       case 'uploaded':
         return <AlertCircle className="h-5 w-5 text-blue-600" />;
       default:
@@ -48,6 +49,7 @@ export function ResultsPage({ onPageChange }: ResultsPageProps = {}) {
         return 'secondary';
       case 'not_submitted':
         return 'outline';
+      case 'submitting':
       case 'uploaded':
         return 'secondary';
       default:
@@ -77,6 +77,7 @@ export function SchemaDetailsPage({ schemaId, onPageChange }: SchemaDetailsPageP
         return <Clock className="h-5 w-5 text-warning" />;
       case 'not_submitted':
         return <AlertCircle className="h-5 w-5 text-muted-foreground" />;
+      case 'submitting':
       case 'uploaded':
         return <AlertCircle className="h-5 w-5 text-blue-600" />;
       default:
@@ -92,6 +93,7 @@ export function SchemaDetailsPage({ schemaId, onPageChange }: SchemaDetailsPageP
         return 'destructive';
       case 'processing':
       case 'pending':
+      case 'submitting':
       case 'uploaded':
         return 'secondary';
       case 'not_submitted':
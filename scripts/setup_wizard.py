@@ -11,6 +11,7 @@ This wizard guides users through the complete setup process including:
 
 import json
 import os
+import signal
 import subprocess
 import sys
 from datetime import datetime
@@ -713,6 +714,19 @@ def deploy_job(state: SetupState) -> bool:
   return True
 
 
+def _kill_process_group(proc: subprocess.Popen) -> None:
+  """Kill a process started with start_new_session=True and all its descendants.
+
+  Args:
+      proc: Process whose process group should be killed
+  """
+  try:
+    os.killpg(proc.pid, signal.SIGKILL)
+  except ProcessLookupError:
+    pass
+  proc.wait()
+
+
 def configure_app_resources(state: SetupState) -> bool:
   """Configure Databricks App with resources.
 
@@ -834,33 +848,34 @@ def configure_app_resources(state: SetupState) -> bool:
   console.print('[bold cyan]Step 2: Build Frontend[/bold cyan]')
   console.print('[cyan]Building frontend for deployment...[/cyan]')
 
-  # Clean up any existing zombie processes before starting
-  subprocess.run(['pkill', '-9', 'esbuild'], capture_output=True)
-  subprocess.run(['pkill', '-9', 'vite'], capture_output=True)
-
+  # Run the build in its own process group so a single killpg() reaps npm and
+  # every vite/esbuild descendant it spawned, without scanning /proc via pkill.
+  build_proc = None
   try:
-    result = subprocess.run(
-      ['npm', 'run', 'build'], cwd='client', capture_output=True, text=True, timeout=300
+    build_proc = subprocess.Popen(
+      ['npm', 'run', 'build'],
+      cwd='client',
+      stdout=subprocess.PIPE,
+      stderr=subprocess.PIPE,
+      text=True,
+      start_new_session=True,
     )
+    _, stderr = build_proc.communicate(timeout=300)
 
-    if result.returncode != 0:
-      console.print(f'[red]❌ Frontend build failed: {result.stderr}[/red]')
-      # Clean up any zombie esbuild processes
-      subprocess.run(['pkill', '-9', 'esbuild'], capture_output=True)
+    if build_proc.returncode != 0:
+      console.print(f'[red]❌ Frontend build failed: {stderr}[/red]')
+      _kill_process_group(build_proc)
       return False
 
     console.print('[green]✅ Frontend built successfully[/green]')
   except subprocess.TimeoutExpired:
     console.print('[red]❌ Frontend build timed out after 300 seconds[/red]')
-    # Clean up any zombie processes on timeout
-    subprocess.run(['pkill', '-9', 'esbuild'], capture_output=True)
-    subprocess.run(['pkill', '-9', 'vite'], capture_output=True)
-    subprocess.run(['pkill', '-9', '-f', 'npm run build'], capture_output=True)
+    _kill_process_group(build_proc)
     return False
   except Exception as e:
     console.print(f'[red]❌ Frontend build failed: {e}[/red]')
-    # Clean up any zombie processes on error
-    subprocess.run(['pkill', '-9', 'esbuild'], capture_output=True)
+    if build_proc is not None:
+      _kill_process_group(build_proc)
     return False
 
   # ═══════════════════════════════════════════════════════════════════════
@@ -871,7 +886,16 @@ def configure_app_resources(state: SetupState) -> bool:
   console.print('[bold cyan]Step 3: Deploy Source Code[/bold cyan]')
   console.print('[cyan]Deploying source code to app...[/cyan]')
   cmd = build_databricks_cmd(
-    ['databricks', 'apps', 'deploy', app_name, '--source-code-path', workspace_path]
+    [
+      'databricks',
+      'apps',
+      'deploy',
+      app_name,
+      '--source-code-path',
+      workspace_path,
+      '--output',
+      'json',
+    ]
   )
   result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
 
@@ -881,19 +905,26 @@ def configure_app_resources(state: SetupState) -> bool:
 
   console.print('[green]✅ Source code deployed successfully[/green]')
 
-  # Get app URL
-  cmd = build_databricks_cmd(['databricks', 'apps', 'get', app_name, '--output', 'json'])
-  result = subprocess.run(cmd, capture_output=True, text=True)
+  # Get app URL from the deploy response; older CLIs omit it, so fall back to `apps get`
+  app_url = None
+  try:
+    app_url = json.loads(result.stdout).get('url')
+  except (json.JSONDecodeError, AttributeError):
+    pass
 
-  if result.returncode == 0:
-    try:
-      app_data = json.loads(result.stdout)
-      app_url = app_data.get('url')
-      if app_url:
-        state.set_data('app_url', app_url)
-        console.print(f'[green]   App URL: {app_url}[/green]')
-    except json.JSONDecodeError:
-      pass
+  if not app_url:
+    cmd = build_databricks_cmd(['databricks', 'apps', 'get', app_name, '--output', 'json'])
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode == 0:
+      try:
+        app_url = json.loads(result.stdout).get('url')
+      except json.JSONDecodeError:
+        pass
+
+  if app_url:
+    state.set_data('app_url', app_url)
+    console.print(f'[green]   App URL: {app_url}[/green]')
 
   state.mark_phase_complete('app_deployed')
   return True
@@ -1,56 +1,131 @@
 """FastAPI application for Information Extraction App."""
 
+import asyncio
+import hashlib
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
-from server.database import create_tables, init_db_pool, test_db_connection
+from server.config import load_env_file
+from server.database import close_db_pool, create_tables, init_db_pool, test_db_connection
+from server.dependencies.database import require_db
+from server.middleware import (
+  ETagMiddleware,
+  RequestCoalescingMiddleware,
+  RequestIdFilter,
+  RequestIdMiddleware,
+  request_id_var,
+)
 from server.routers import router
 from server.routers.dashboard import router as dashboard_router
+from server.routers.jobs import resume_pending_submissions
 from server.routers.jobs import router as jobs_router
 from server.routers.logs import router as logs_router
 from server.routers.schemas import router as schemas_router
+from server.services.databricks_service import close_jobs_http_client
+
+# Built React app served by the SPA fallback route
+CLIENT_BUILD_DIR = Path('client/build')
 
+# How often the background task re-probes the database for /health
+HEALTH_REFRESH_INTERVAL_SECONDS = 5
 
-# Load environment variables from .env.local if it exists
-def load_env_file(filepath: str) -> None:
-  """Load environment variables from a file."""
-  if Path(filepath).exists():
-    with open(filepath) as f:
-      for line in f:
-        line = line.strip()
-        if line and not line.startswith('#'):
-          key, _, value = line.partition('=')
-          if key and value:
-            os.environ[key] = value
+# Path prefixes owned by the API/docs; the SPA fallback never serves index.html for these
+NON_SPA_PREFIXES = ('api/', 'health', 'docs', 'openapi.json', 'redoc')
 
 
-# Load .env files
-load_env_file('.env')
-load_env_file('.env.local')
+# Load .env files (earlier files take precedence over later ones)
+for env_file in ('.env.local', '.env'):
+  load_env_file(env_file)
 
 # Configure logging to show full tracebacks
 import logging
 
 logging.basicConfig(
-  level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+  level=logging.INFO,
+  format='%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s',
 )
+for log_handler in logging.getLogger().handlers:
+  log_handler.addFilter(RequestIdFilter())
 
 # Also configure uvicorn logger to show exceptions
 uvicorn_logger = logging.getLogger('uvicorn.error')
 uvicorn_logger.setLevel(logging.DEBUG)
 
+logger = logging.getLogger(__name__)
+
+# Separator line around logged errors
+LOG_SEPARATOR = '=' * 80
+
+
+def _startup_db() -> None:
+  """Create the connection pool, run table creation/migrations and probe the database."""
+  try:
+    init_db_pool()
+    create_tables()
+    if not test_db_connection():
+      logger.warning('⚠️  Database connection test failed')
+    else:
+      logger.info('✅ Database connection successful')
+  except Exception as e:
+    logger.error(f'❌ Database initialization failed: {e}')
+    raise
+
+
+def _load_client_build(app: FastAPI) -> None:
+  """Read index.html into memory and stat every file in the client build directory."""
+  index_path = CLIENT_BUILD_DIR / 'index.html'
+  app.state.index_html = index_path.read_bytes() if index_path.exists() else None
+  app.state.index_etag = (
+    f'"{hashlib.md5(app.state.index_html).hexdigest()}"' if app.state.index_html else None
+  )
+  # Map of build-relative path -> stat result, so responses don't re-stat the file
+  app.state.static_files = (
+    {
+      path.relative_to(CLIENT_BUILD_DIR).as_posix(): path.stat()
+      for path in CLIENT_BUILD_DIR.rglob('*')
+      if path.is_file()
+    }
+    if CLIENT_BUILD_DIR.exists()
+    else {}
+  )
+
+
+async def _refresh_db_status(app: FastAPI) -> None:
+  """Periodically probe the database and cache the result for /health."""
+  try:
+    await app.state.db_ready
+  except Exception:
+    app.state.db_status = 'error'
+    return
+
+  while True:
+    try:
+      connected = await asyncio.to_thread(test_db_connection)
+      app.state.db_status = 'connected' if connected else 'disconnected'
+    except Exception:
+      app.state.db_status = 'error'
+    await asyncio.sleep(HEALTH_REFRESH_INTERVAL_SECONDS)
+
+
+async def _resume_submissions(app: FastAPI) -> None:
+  """Once the database is ready, trigger runs for jobs a previous process left 'submitting'."""
+  try:
+    await app.state.db_ready
+    await resume_pending_submissions()
+  except Exception as e:
+    logger.error(f'❌ Resuming job submissions failed: {e}')
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
   """Manage application lifespan."""
-  logger = logging.getLogger(__name__)
-
   # Startup: Load and validate configuration
   try:
     from server.config import get_config
@@ -65,23 +140,33 @@ async def lifespan(app: FastAPI):
     logger.error('   Application startup aborted due to configuration errors')
     raise
 
-  # Initialize database
-  try:
-    init_db_pool()
-    create_tables()
-    if not test_db_connection():
-      logger.warning('⚠️  Database connection test failed')
-    else:
-      logger.info('✅ Database connection successful')
-  except Exception as e:
-    logger.error(f'❌ Database initialization failed: {e}')
-    raise
+  # Cache the SPA build; its files don't change for the life of the process
+  _load_client_build(app)
+
+  # Initialize database in the background so the port opens immediately;
+  # DB-backed routes wait on this task via the require_db dependency
+  app.state.db_ready = asyncio.create_task(asyncio.to_thread(_startup_db))
+
+  # Keep the /health database status fresh without probing on every request
+  app.state.db_status = 'starting'
+  health_refresher = asyncio.create_task(_refresh_db_status(app))
+
+  # Uploads whose run trigger was cut short by a restart are resubmitted
+  submission_resumer = asyncio.create_task(_resume_submissions(app))
 
   yield
 
   # Shutdown: Clean up resources
   logger.info('🛑 Application shutdown initiated')
-  # Add any cleanup code here if needed
+  health_refresher.cancel()
+  submission_resumer.cancel()
+  try:
+    await app.state.db_ready
+  except Exception:
+    pass
+  close_db_pool()
+  logger.info('✅ Database connection pool closed')
+  await close_jobs_http_client()
 
 
 app = FastAPI(
@@ -89,8 +174,19 @@ app = FastAPI(
   description='Document information extraction using Databricks AI/ML capabilities',
   version='0.1.0',
   lifespan=lifespan,
+  default_response_class=ORJSONResponse,
 )
 
+# Innermost: identical in-flight API GETs share one execution
+app.add_middleware(RequestCoalescingMiddleware)
+
+# Added before CORS so CORS headers are applied on top of 304 responses
+app.add_middleware(ETagMiddleware)
+
+# Outside ETagMiddleware so tags are computed over the uncompressed body; small
+# responses such as /me are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.add_middleware(
   CORSMiddleware,
   allow_origins=[
@@ -100,53 +196,54 @@ app.add_middleware(
     'http://127.0.0.1:5173',
   ],
   allow_credentials=True,
-  allow_methods=['*'],
-  allow_headers=['*'],
+  allow_methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'],
+  allow_headers=['Accept', 'Authorization', 'Content-Type', 'X-Requested-With'],
+  # Let browsers cache preflight responses for a day
+  max_age=86400,
 )
 
+# Outermost user middleware, so replayed, 304 and HTTPException responses carry their own ID.
+# Unhandled exceptions are answered by Starlette's ServerErrorMiddleware, which sits
+# outside it, so global_exception_handler sets the ID on its log line and response itself.
+app.add_middleware(RequestIdMiddleware)
+
 
 # Global exception handler for HTTPException to log 500-level errors
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
   """Log HTTPException errors (especially 500-level) with context."""
-  import traceback
-
-  exception_logger = logging.getLogger(__name__)
-
   # Log 500-level errors with full details
   if exc.status_code >= 500:
-    exception_logger.error('=' * 80)
-    exception_logger.error(f'HTTP {exc.status_code} ERROR: {request.method} {request.url.path}')
-    exception_logger.error(f'Detail: {exc.detail}')
-    exception_logger.error('Traceback:')
-    exception_logger.error(traceback.format_exc())
-    exception_logger.error('=' * 80)
+    logger.error(LOG_SEPARATOR)
+    logger.error(f'HTTP {exc.status_code} ERROR: {request.method} {request.url.path}')
+    logger.error(f'Detail: {exc.detail}')
+    # exc_info defers traceback formatting to the log handler
+    logger.error('Traceback:', exc_info=exc)
+    logger.error(LOG_SEPARATOR)
 
   # Return the default HTTPException response
-  return JSONResponse(
+  return ORJSONResponse(
     status_code=exc.status_code, content={'detail': exc.detail, 'path': str(request.url.path)}
   )
 
 
-# Global exception handler to log all unhandled exceptions
+# Global exception handler: routes let unexpected errors propagate here instead of
+# logging and re-wrapping them individually
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-  """Catch all unhandled exceptions and log with full traceback."""
-  import traceback
-
-  exception_logger = logging.getLogger(__name__)
-
-  # Log the full exception details
-  exception_logger.error('=' * 80)
-  exception_logger.error(f'UNHANDLED EXCEPTION: {request.method} {request.url.path}')
-  exception_logger.error(f'Exception Type: {type(exc).__name__}')
-  exception_logger.error(f'Exception Message: {str(exc)}')
-  exception_logger.error('Full Traceback:')
-  exception_logger.error(traceback.format_exc())
-  exception_logger.error('=' * 80)
+  """Log an unhandled exception once, with its traceback, and return a 500."""
+  # RequestIdMiddleware has already returned; its ID is still in the shared scope state
+  request_id = getattr(request.state, 'request_id', None)
+  token = request_id_var.set(request_id)
+  try:
+    logger.exception(
+      f'Unhandled {type(exc).__name__} on {request.method} {request.url.path}', exc_info=exc
+    )
+  finally:
+    request_id_var.reset(token)
 
   # Return a proper error response
-  return JSONResponse(
+  return ORJSONResponse(
     status_code=500,
     content={
       'detail': 'Internal Server Error',
@@ -154,56 +251,29 @@ async def global_exception_handler(request: Request, exc: Exception):
       'type': type(exc).__name__,
       'path': str(request.url.path),
     },
+    headers={'x-request-id': request_id} if request_id else None,
   )
 
 
-# Middleware to catch and log all exceptions with proper traceback context
-@app.middleware('http')
-async def exception_logging_middleware(request: Request, call_next):
-  """Catch all exceptions and log them with full tracebacks before re-raising."""
-  import traceback
-
-  exception_logger = logging.getLogger(__name__)
-
-  try:
-    return await call_next(request)
-  except Exception as exc:
-    # Log the exception with full traceback context
-    exc_type = type(exc).__name__
-    exc_detail = str(exc)
-
-    # Determine status code
-    if isinstance(exc, HTTPException):
-      status_code = exc.status_code
-      if status_code >= 500:
-        exception_logger.error(f'HTTP {status_code} on {request.method} {request.url}')
-        exception_logger.error(f'Detail: {exc.detail}')
-        exception_logger.error(f'Full traceback:\n{traceback.format_exc()}')
-    else:
-      exception_logger.error(f'Unhandled {exc_type} on {request.method} {request.url}')
-      exception_logger.error(f'Exception: {exc_detail}')
-      exception_logger.error(f'Full traceback:\n{traceback.format_exc()}')
-
-    # Re-raise to let FastAPI's exception handlers format the response
-    raise
-
-
 app.include_router(router, prefix='/api', tags=['api'])
-app.include_router(dashboard_router, prefix='/api', tags=['dashboard'])
-app.include_router(logs_router, prefix='/api', tags=['logs'])
-app.include_router(schemas_router, prefix='/api', tags=['schemas'])
-app.include_router(jobs_router, prefix='/api', tags=['jobs'])
+app.include_router(
+  dashboard_router, prefix='/api', tags=['dashboard'], dependencies=[Depends(require_db)]
+)
+app.include_router(logs_router, prefix='/api', tags=['logs'], dependencies=[Depends(require_db)])
+app.include_router(
+  schemas_router, prefix='/api', tags=['schemas'], dependencies=[Depends(require_db)]
+)
+app.include_router(jobs_router, prefix='/api', tags=['jobs'], dependencies=[Depends(require_db)])
 
 
 @app.get('/health')
-async def health():
+async def health(request: Request):
   """Health check endpoint."""
-  try:
-    db_status = 'connected' if test_db_connection() else 'disconnected'
-  except Exception:
-    db_status = 'error'
-
-  return {'status': 'healthy', 'database': db_status, 'service': 'information-extraction-app'}
+  return {
+    'status': 'healthy',
+    'database': request.app.state.db_status,
+    'service': 'information-extraction-app',
+  }
 
 
 # ============================================================================
@@ -211,36 +281,51 @@ async def health():
 # ============================================================================
 
 
-# Add explicit SPA fallback route for deep links
-@app.get('/{full_path:path}')
-async def spa_fallback(full_path: str):
-  """Serve index.html for all non-API routes to support SPA routing."""
-  # Skip if this is an API route
-  if full_path.startswith('api/') or full_path.startswith('health') or full_path.startswith('docs'):
-    # This shouldn't happen as these routes are already defined above
-    return JSONResponse(status_code=404, content={'detail': 'Not Found'})
-
-  # Check if it's a static file request (has file extension)
-  if '.' in full_path.split('/')[-1]:
-    # Try to serve the static file
-    static_file_path = f'client/build/{full_path}'
-    if os.path.exists(static_file_path):
-      return FileResponse(static_file_path)
-    else:
-      return JSONResponse(status_code=404, content={'detail': 'File not found'})
+class ImmutableStaticFiles(StaticFiles):
+  """StaticFiles for Vite's content-hashed bundles, cached by browsers for a year."""
 
-  # For all other routes (SPA deep links), serve index.html
-  index_path = 'client/build/index.html'
-  if os.path.exists(index_path):
-    return FileResponse(index_path)
-  else:
-    return JSONResponse(status_code=404, content={'detail': 'React app not built'})
+  def file_response(self, *args, **kwargs) -> Response:
+    """Serve the file with a long-lived immutable Cache-Control header."""
+    response = super().file_response(*args, **kwargs)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
 
 # Mount static files for serving assets (CSS, JS, images, etc.)
 # This will handle requests like /assets/index-abc123.js
+# Mounted before the SPA fallback route, whose catch-all path would otherwise shadow them
 if os.path.exists('client/build/assets'):
-  app.mount('/assets', StaticFiles(directory='client/build/assets'), name='assets')
+  app.mount('/assets', ImmutableStaticFiles(directory='client/build/assets'), name='assets')
 if os.path.exists('client/build/logo'):
   app.mount('/logo', StaticFiles(directory='client/build/logo'), name='logo')
 # Mount any other static directories as needed
+
+
+# Add explicit SPA fallback route for deep links
+@app.get('/{full_path:path}')
+async def spa_fallback(full_path: str, request: Request):
+  """Serve index.html for all non-API routes to support SPA routing."""
+  # Files present in the build at startup are served directly
+  stat_result = request.app.state.static_files.get(full_path)
+  if stat_result is not None:
+    return FileResponse(CLIENT_BUILD_DIR / full_path, stat_result=stat_result)
+
+  # Skip if this is an API route
+  if full_path.startswith(NON_SPA_PREFIXES):
+    # This shouldn't happen as these routes are already defined above
+    return ORJSONResponse(status_code=404, content={'detail': 'Not Found'})
+
+  # Missing static file request (has file extension)
+  if '.' in full_path.rpartition('/')[2]:
+    return ORJSONResponse(status_code=404, content={'detail': 'File not found'})
+
+  # For all other routes (SPA deep links), serve the cached index.html
+  index_html = request.app.state.index_html
+  if index_html is not None:
+    return Response(
+      index_html,
+      media_type='text/html',
+      headers={'Cache-Control': 'no-cache', 'ETag': request.app.state.index_etag},
+    )
+  else:
+    return ORJSONResponse(status_code=404, content={'detail': 'React app not built'})
@@ -6,6 +6,11 @@ This module provides a unified configuration system:
   - DB_PASSWORD: Database password (from .env.local locally, app.yaml in Databricks)
   - UPLOAD_BASE_PATH: Upload directory (optional, defaults to base.yaml value)
   - DATABRICKS_JOB_ID: Job ID (optional, defaults to base.yaml value)
+  - DB_POOL_MIN / DB_POOL_MAX: Connection pool size (optional, default to base.yaml
+    database.pool_min / database.pool_max, then 5 / 25)
+  - DB_TRANSACTION_POOLING: Set to true when database.host points at a transaction-mode
+    pooler such as PgBouncer (optional, defaults to base.yaml
+    database.transaction_pooling, then false)
 
 Usage:
     from server.config import get_config
@@ -15,13 +20,33 @@ Usage:
     print(config.upload.base_path)
 """
 
+import functools
 import os
+import pickle
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import yaml
 
+__all__ = [
+  'AppConfig',
+  'DatabaseConfig',
+  'DatabricksConfig',
+  'UploadConfig',
+  'get_config',
+  'load_config',
+  'load_env_file',
+  'reset_config',
+]
+
+# Pickled copy of the parsed base.yaml, reused across cold starts while base.yaml is
+# unchanged. Only base.yaml is cached; secrets from the environment never touch disk.
+_BASE_CONFIG_CACHE_NAME = '.base.yaml.cache.pkl'
+
+# libyaml-backed loader when available; PyYAML's pure-Python SafeLoader otherwise
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 @dataclass
 class DatabaseConfig:
@@ -33,6 +58,13 @@ class DatabaseConfig:
   user: str
   password: str
   schema: str
+  # Connections opened up front, so the first requests after boot don't pay the
+  # TCP + TLS + auth handshake, and the most the pool will hold
+  pool_min_conn: int = 5
+  pool_max_conn: int = 25
+  # Behind a transaction-mode pooler (PgBouncer) session state such as PREPARE can't be
+  # relied on, and the in-process pool only needs a few connections per worker
+  transaction_pooling: bool = False
 
 
 @dataclass
@@ -65,6 +97,61 @@ class AppConfig:
   upload: Optional[UploadConfig]
 
 
+def _load_base_yaml(base_yaml: Path) -> Dict[str, Any]:
+  """Load base.yaml, reusing the pickled cache when the file hasn't changed.
+
+  Args:
+      base_yaml: Path to config/base.yaml
+
+  Returns:
+      Dict[str, Any]: Parsed base configuration
+  """
+  stat = base_yaml.stat()
+  cache_key = (stat.st_mtime_ns, stat.st_size)
+  cache_path = base_yaml.parent / _BASE_CONFIG_CACHE_NAME
+
+  try:
+    with open(cache_path, 'rb') as f:
+      cached_key, base = pickle.load(f)
+    if cached_key == cache_key:
+      return base
+  except Exception:
+    # Missing, stale-format or unreadable cache: fall through and re-parse
+    pass
+
+  with open(base_yaml) as f:
+    base = yaml.load(f, Loader=_YAML_LOADER)
+
+  try:
+    fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+      pickle.dump((cache_key, base), f, protocol=pickle.HIGHEST_PROTOCOL)
+  except OSError:
+    # Read-only deployments just skip the cache
+    pass
+
+  return base
+
+
+def load_env_file(filepath: Union[str, Path]) -> None:
+  """Load environment variables from a file.
+
+  Variables already present in the environment (e.g. injected by Databricks Apps)
+  are left untouched. Surrounding quotes are stripped from values.
+  """
+  path = Path(filepath)
+  if not path.exists():
+    return
+
+  for line in path.read_text().splitlines():
+    line = line.strip()
+    if line and not line.startswith('#'):
+      key, _, value = line.partition('=')
+      key, value = key.strip(), value.strip().strip('"\'')
+      if key and value:
+        os.environ.setdefault(key, value)
+
+
 def load_config() -> AppConfig:
   """Load configuration from base.yaml and environment variables.
 
@@ -82,21 +169,14 @@ def load_config() -> AppConfig:
   if not base_yaml.exists():
     raise FileNotFoundError(f'Base configuration not found: {base_yaml}')
 
-  with open(base_yaml) as f:
-    base = yaml.safe_load(f)
+  base = _load_base_yaml(base_yaml)
 
   # Get DB_PASSWORD from environment or .env.local
   db_password = os.getenv('DB_PASSWORD')
   if not db_password:
     # Try loading from .env.local
-    env_local = Path(__file__).parent.parent / '.env.local'
-    if env_local.exists():
-      with open(env_local) as f:
-        for line in f:
-          line = line.strip()
-          if line.startswith('DB_PASSWORD='):
-            db_password = line.split('=', 1)[1]
-            break
+    load_env_file(Path(__file__).parent.parent / '.env.local')
+    db_password = os.getenv('DB_PASSWORD')
 
   if not db_password:
     raise ValueError(
@@ -109,6 +189,12 @@ def load_config() -> AppConfig:
   if not upload_base_path:
     upload_base_path = base['upload'].get('base_path', '/tmp')
 
+  pool_min_conn = _int_setting('DB_POOL_MIN', base['database'].get('pool_min', 5))
+  pool_max_conn = _int_setting('DB_POOL_MAX', base['database'].get('pool_max', 25))
+  transaction_pooling = _bool_setting(
+    'DB_TRANSACTION_POOLING', base['database'].get('transaction_pooling', False)
+  )
+
   job_id_str = os.getenv('DATABRICKS_JOB_ID')
   if job_id_str:
     try:
@@ -131,6 +217,9 @@ def load_config() -> AppConfig:
       user=base['database']['user'],
       password=db_password,
       schema=base['database']['schema'],
+      pool_min_conn=pool_min_conn,
+      pool_max_conn=pool_max_conn,
+      transaction_pooling=transaction_pooling,
     ),
     databricks=(
       DatabricksConfig(job_id=job_id, output_table=base['databricks']['output_table'])
@@ -153,10 +242,26 @@ def load_config() -> AppConfig:
   )
 
 
-# Global config instance (loaded once at startup)
-_config: Optional[AppConfig] = None
+def _int_setting(env_var: str, default: int) -> int:
+  """Read an integer setting from the environment, falling back to a default."""
+  value = os.getenv(env_var)
+  if not value:
+    return int(default)
+  try:
+    return int(value)
+  except ValueError as e:
+    raise ValueError(f'{env_var} must be an integer, got: {value}') from e
+
+
+def _bool_setting(env_var: str, default: bool) -> bool:
+  """Read a boolean setting (true/false, 1/0, yes/no) from the environment."""
+  value = os.getenv(env_var)
+  if not value:
+    return bool(default)
+  return value.strip().lower() in ('1', 'true', 'yes', 'on')
 
 
+@functools.lru_cache(maxsize=1)
 def get_config() -> AppConfig:
   """Get the application configuration (singleton pattern).
 
@@ -169,16 +274,12 @@ def get_config() -> AppConfig:
       ValueError: If configuration is invalid or missing
       FileNotFoundError: If required config files are missing
   """
-  global _config
-  if _config is None:
-    _config = load_config()
-  return _config
+  return load_config()
 
 
 def reset_config() -> None:
-  """Reset the global config instance (useful for testing).
+  """Reset the cached config instance (useful for testing).
 
   This forces a reload on the next call to get_config().
   """
-  global _config
-  _config = None
+  get_config.cache_clear()
@@ -1,18 +1,25 @@
 """Database connection and operations for Information Extraction App."""
 
-import json
+import csv
+import io
 import logging
+import threading
+import time
 import traceback
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import orjson
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from pydantic import TypeAdapter
 
 from server.models import (
   DBDocument,
   DBExtractionJob,
-  DBExtractionResult,
   DBExtractionSchema,
   Document,
   ExtractionJob,
@@ -25,8 +32,124 @@ from server.models import (
 # DATABASE CONNECTION
 # ============================================================================
 
-# Global connection pool
-_connection_pool: Optional[SimpleConnectionPool] = None
+# Global connection pool, created and closed under _pool_lock so racing first
+# requests can't each build (and leak) a pool
+_connection_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+
+# Rows per round trip when streaming large result sets from server-side cursors
+RESULTS_FETCH_BATCH_SIZE = 500
+
+# Bulk document inserts smaller than this use one multi-row INSERT (execute_values, in
+# pages of BULK_INSERT_PAGE_SIZE rows); larger ones are staged with COPY
+COPY_MIN_ROWS = 100
+BULK_INSERT_PAGE_SIZE = 1000
+
+# Bulk loads of at least this many rows refresh planner statistics with ANALYZE rather
+# than waiting for autovacuum to notice the new rows
+ANALYZE_MIN_ROWS = 500
+
+# TCP keepalives so idle pooled connections survive NAT/load-balancer timeouts and
+# dead peers are detected instead of hanging the next borrower
+DB_KEEPALIVE_OPTIONS = {
+  'keepalives': 1,
+  'keepalives_idle': 30,
+  'keepalives_interval': 10,
+  'keepalives_count': 5,
+}
+
+
+# Hot point lookups and updates, PREPAREd once per connection and run with EXECUTE afterwards so
+# the server skips parsing and planning them on every call. Written with %s
+# placeholders so they can also run as plain statements.
+PREPARED_STATEMENTS = {
+  'get_extraction_schema': """
+        SELECT id, name, description, fields::text, is_active, created_at
+        FROM information_extraction.extraction_schemas
+        WHERE id = %s
+    """,
+  'get_extraction_job': """
+        SELECT id, name, schema_id, status, created_at, updated_at,
+               completed_at, error_message, databricks_run_id
+        FROM information_extraction.extraction_jobs
+        WHERE id = %s
+    """,
+  'get_extraction_job_with_schema': """
+        SELECT j.id, j.name, j.schema_id, j.status, j.created_at, j.updated_at,
+               j.completed_at, j.error_message, j.databricks_run_id,
+               s.name as schema_name
+        FROM information_extraction.extraction_jobs j
+        LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id
+        WHERE j.id = %s
+    """,
+  'get_documents_by_job': """
+        SELECT id, job_id, filename, file_path, file_size, upload_time
+        FROM information_extraction.documents
+        WHERE job_id = %s
+        ORDER BY upload_time DESC
+    """,
+  # The updates use one fixed statement for every update shape, so a single plan
+  # serves all callers. Each column takes a pair of parameters, (is it being set, new
+  # value), so a column can be set to NULL; see _update_params. Pairs follow
+  # SCHEMA_UPDATE_COLUMNS / JOB_UPDATE_COLUMNS, then the id.
+  'update_extraction_schema': """
+        UPDATE information_extraction.extraction_schemas
+        SET name = CASE WHEN %s THEN %s ELSE name END,
+            description = CASE WHEN %s THEN %s ELSE description END,
+            fields = CASE WHEN %s THEN %s ELSE fields END,
+            is_active = CASE WHEN %s THEN %s ELSE is_active END
+        WHERE id = %s
+        RETURNING id, name, description, fields, is_active, created_at
+    """,
+  'update_extraction_job': """
+        UPDATE information_extraction.extraction_jobs
+        SET name = CASE WHEN %s THEN %s ELSE name END,
+            schema_id = CASE WHEN %s THEN %s ELSE schema_id END,
+            status = CASE WHEN %s THEN %s ELSE status END,
+            upload_directory = CASE WHEN %s THEN %s ELSE upload_directory END,
+            databricks_run_id = CASE WHEN %s THEN %s ELSE databricks_run_id END,
+            completed_at = CASE WHEN %s THEN %s ELSE completed_at END,
+            error_message = CASE WHEN %s THEN %s ELSE error_message END,
+            created_by = CASE WHEN %s THEN %s ELSE created_by END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = %s
+        RETURNING id, name, schema_id, status, upload_directory, databricks_run_id,
+                  created_at, updated_at, completed_at, error_message
+    """,
+}
+
+
+# Off behind a transaction-mode pooler such as PgBouncer, where consecutive
+# transactions may run on different server connections that never saw the PREPARE
+_use_prepared_statements = True
+
+
+class PreparedStatementConnection(psycopg2.extensions.connection):
+  """Connection that remembers which PREPARED_STATEMENTS it has already prepared."""
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.prepared_statements = set()
+
+
+def execute_prepared(cursor, name: str, params: tuple) -> None:
+  """Run a statement from PREPARED_STATEMENTS, preparing it on first use per connection.
+
+  Statements are prepared lazily rather than when the connection opens, because the
+  pool is created before create_tables() has run.
+  """
+  sql = PREPARED_STATEMENTS[name]
+  if not _use_prepared_statements:
+    cursor.execute(sql, params)
+    return
+
+  conn = cursor.connection
+  if name not in conn.prepared_statements:
+    positional = sql % tuple(f'${index}' for index in range(1, len(params) + 1))
+    cursor.execute(f'PREPARE {name} AS {positional}')
+    conn.prepared_statements.add(name)
+  placeholders = ', '.join(['%s'] * len(params))
+  cursor.execute(f'EXECUTE {name} ({placeholders})', params)
 
 
 def get_db_config() -> Dict[str, str]:
@@ -53,10 +176,26 @@ def get_db_config() -> Dict[str, str]:
 
 def init_db_pool() -> None:
   """Initialize the database connection pool."""
-  global _connection_pool
-  if _connection_pool is None:
+  global _connection_pool, _use_prepared_statements
+  if _connection_pool is not None:
+    return
+  with _pool_lock:
+    if _connection_pool is not None:
+      return
+    # Decode JSONB columns with orjson rather than the stdlib json module
+    psycopg2.extras.register_default_jsonb(globally=True, loads=orjson.loads)
+    from server.config import get_config
+
     config = get_db_config()
-    _connection_pool = SimpleConnectionPool(minconn=1, maxconn=10, **config)
+    database_config = get_config().database
+    _use_prepared_statements = not database_config.transaction_pooling
+    _connection_pool = ThreadedConnectionPool(
+      minconn=database_config.pool_min_conn,
+      maxconn=database_config.pool_max_conn,
+      connection_factory=PreparedStatementConnection,
+      **config,
+      **DB_KEEPALIVE_OPTIONS,
+    )
 
 
 def get_db_connection():
@@ -66,284 +205,737 @@ def get_db_connection():
   return _connection_pool.getconn()
 
 
-def return_db_connection(conn):
-  """Return a database connection to the pool."""
+def return_db_connection(conn, close: bool = False):
+  """Return a database connection to the pool.
+
+  The connection is discarded instead of reused when ``close`` is set (e.g. after an
+  error left it in an unknown state) or when it has already been closed.
+  """
   if _connection_pool:
-    _connection_pool.putconn(conn)
+    _connection_pool.putconn(conn, close=close or bool(conn.closed))
+
+
+@contextmanager
+def db_cursor(dict_rows: bool = False, name: Optional[str] = None) -> Iterator[Any]:
+  """Borrow a pooled connection and yield a cursor on it as one transaction.
+
+  Commits when the block exits normally and rolls back if it raises, so no connection
+  goes back to the pool idle in a transaction. A connection that can't even be rolled
+  back is discarded.
+
+  Args:
+      dict_rows: Return rows as dicts (RealDictCursor) instead of tuples.
+      name: Use a server-side cursor with this name, for streaming large results.
+  """
+  conn = get_db_connection()
+  broken = False
+  try:
+    cursor_factory = psycopg2.extras.RealDictCursor if dict_rows else None
+    with conn.cursor(name=name, cursor_factory=cursor_factory) as cursor:
+      yield cursor
+    conn.commit()
+  except BaseException:
+    # BaseException too: a cancelled request or an abandoned generator must not hand the
+    # next borrower a connection that is still inside this transaction
+    try:
+      conn.rollback()
+    except psycopg2.Error:
+      broken = True
+    raise
+  finally:
+    return_db_connection(conn, close=broken)
+
+
+def copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+  """Load rows into a table with COPY FROM STDIN (CSV), writing None as NULL."""
+  buffer = io.StringIO()
+  writer = csv.writer(buffer)
+  for row in rows:
+    writer.writerow(['\\N' if value is None else value for value in row])
+  buffer.seek(0)
+  cursor.copy_expert(
+    f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+  )
+
+
+def analyze_table(table: str) -> None:
+  """Refresh planner statistics for a table (schema-qualified name) after a bulk load."""
+  logger = logging.getLogger(__name__)
+  try:
+    with db_cursor() as cursor:
+      cursor.execute(f'ANALYZE {table}')
+  except psycopg2.Error as e:
+    logger.warning(f'ANALYZE {table} failed: {str(e)}')
+
+
+@contextmanager
+def try_advisory_xact_lock(lock_id: int) -> Iterator[bool]:
+  """Try to take a transaction-scoped advisory lock and yield whether it was taken.
+
+  The lock, and the pooled connection whose transaction holds it, are kept until the
+  block exits.
+  """
+  with db_cursor() as cursor:
+    cursor.execute('SELECT pg_try_advisory_xact_lock(%s)', (lock_id,))
+    yield cursor.fetchone()[0]
 
 
 def close_db_pool() -> None:
   """Close all database connections."""
   global _connection_pool
-  if _connection_pool:
-    _connection_pool.closeall()
-    _connection_pool = None
+  with _pool_lock:
+    if _connection_pool:
+      _connection_pool.closeall()
+      _connection_pool = None
 
 
 # ============================================================================
 # DATABASE SCHEMA CREATION
 # ============================================================================
 
+# Version of SCHEMA_DDL; bump it whenever the DDL changes so existing databases re-run it
+SCHEMA_VERSION = 20
+
+# pg_advisory_xact_lock key taken by create_tables() so only one process runs the DDL
+SCHEMA_LOCK_ID = 7_270_419
+
+# pg_try_advisory_xact_lock key held while one process resubmits 'submitting' jobs
+SUBMISSION_RESUME_LOCK_ID = 7_270_420
+
+# All idempotent DDL, sent to the server in a single round-trip by create_tables()
+SCHEMA_DDL = """
+-- Create schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS information_extraction;
+
+-- Create extraction_schemas table (updated to match notebook expectations)
+CREATE TABLE IF NOT EXISTS information_extraction.extraction_schemas (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT DEFAULT '',
+    fields JSONB NOT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Migrate existing schema_definition column to fields column
+DO $$
+BEGIN
+    -- Check if schema_definition column exists and fields doesn't
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+              WHERE table_schema = 'information_extraction'
+              AND table_name = 'extraction_schemas'
+              AND column_name = 'schema_definition')
+       AND NOT EXISTS (SELECT 1 FROM information_schema.columns
+                      WHERE table_schema = 'information_extraction'
+                      AND table_name = 'extraction_schemas'
+                      AND column_name = 'fields') THEN
+        -- Add fields column
+        ALTER TABLE information_extraction.extraction_schemas ADD COLUMN fields TEXT;
+
+        -- Copy data from schema_definition to fields
+        UPDATE information_extraction.extraction_schemas SET fields = schema_definition;
+
+        -- Make fields NOT NULL
+        ALTER TABLE information_extraction.extraction_schemas ALTER COLUMN fields SET NOT NULL;
+
+        -- Drop old column
+        ALTER TABLE information_extraction.extraction_schemas DROP COLUMN schema_definition;
+    END IF;
+END $$;
+
+-- Create extraction_jobs table (updated with upload_directory)
+CREATE TABLE IF NOT EXISTS information_extraction.extraction_jobs (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    name TEXT NOT NULL,
+    schema_id BIGINT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'not_submitted',
+    upload_directory TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    error_message TEXT,
+    databricks_run_id BIGINT,
+    FOREIGN KEY (schema_id) REFERENCES information_extraction.extraction_schemas (id)
+);
+
+-- Create documents table
+CREATE TABLE IF NOT EXISTS information_extraction.documents (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    job_id BIGINT NOT NULL,
+    filename TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    file_size INTEGER NOT NULL,
+    upload_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (job_id) REFERENCES information_extraction.extraction_jobs (id) ON DELETE CASCADE
+);
+
+-- Create extraction_results table
+CREATE TABLE IF NOT EXISTS information_extraction.extraction_results (
+    job_id BIGINT NOT NULL,
+    document_id BIGINT NOT NULL,
+    schema_id BIGINT NOT NULL,
+    extracted_data TEXT NOT NULL,
+    confidence_scores JSONB,
+    file_content_checksum TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, document_id, schema_id),
+    FOREIGN KEY (job_id) REFERENCES information_extraction.extraction_jobs (id) ON DELETE CASCADE,
+    FOREIGN KEY (document_id) REFERENCES information_extraction.documents (id) ON DELETE CASCADE,
+    FOREIGN KEY (schema_id) REFERENCES information_extraction.extraction_schemas (id)
+);
+
+-- Create upload_logs table (required by notebook)
+CREATE TABLE IF NOT EXISTS information_extraction.upload_logs (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    analysis_id BIGINT NOT NULL,
+    upload_directory TEXT NOT NULL,
+    event_type TEXT DEFAULT 'upload',
+    message TEXT,
+    details TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (analysis_id) REFERENCES information_extraction.extraction_jobs (id)
+);
+
+-- Create indexes for better performance
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON information_extraction.extraction_jobs (status);
+CREATE INDEX IF NOT EXISTS idx_jobs_schema_id ON information_extraction.extraction_jobs (schema_id);
+CREATE INDEX IF NOT EXISTS idx_upload_logs_analysis_id
+    ON information_extraction.upload_logs (analysis_id);
+
+-- Job listing: newest-first ordering. Also covers the dashboard's 30-day window
+-- (id, status) so it is answered by an index-only scan.
+CREATE INDEX IF NOT EXISTS idx_jobs_created_covering
+    ON information_extraction.extraction_jobs (created_at DESC) INCLUDE (id, status);
+DROP INDEX IF EXISTS information_extraction.idx_jobs_created_at_desc;
+
+-- Time-range filters (e.g. dashboard "last 30 days"). Rows are appended in time order,
+-- so compact BRIN indexes are enough here.
+CREATE INDEX IF NOT EXISTS idx_jobs_created_brin
+    ON information_extraction.extraction_jobs USING BRIN (created_at);
+CREATE INDEX IF NOT EXISTS idx_documents_upload_time_brin
+    ON information_extraction.documents USING BRIN (upload_time);
+CREATE INDEX IF NOT EXISTS idx_results_created_brin
+    ON information_extraction.extraction_results USING BRIN (created_at);
+CREATE INDEX IF NOT EXISTS idx_upload_logs_created_brin
+    ON information_extraction.upload_logs USING BRIN (created_at);
+
+-- Jobs created but never submitted to Databricks (listed with status 'not_submitted')
+CREATE INDEX IF NOT EXISTS idx_jobs_active
+    ON information_extraction.extraction_jobs (created_at DESC)
+    WHERE databricks_run_id IS NULL AND status NOT IN ('failed', 'uploaded');
+CREATE INDEX IF NOT EXISTS idx_jobs_status_not_null
+    ON information_extraction.extraction_jobs (status) INCLUDE (id, databricks_run_id)
+    WHERE status IS NOT NULL;
+
+-- === DATABASE MIGRATIONS (Run after all tables are created) ===
+
+-- Add upload_directory column to extraction_jobs if it doesn't exist
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'information_extraction'
+                  AND table_name = 'extraction_jobs'
+                  AND column_name = 'upload_directory') THEN
+        ALTER TABLE information_extraction.extraction_jobs ADD COLUMN upload_directory TEXT;
+    END IF;
+END $$;
+
+-- Add user tracking columns for auditing
+DO $$
+BEGIN
+    -- Add created_by to extraction_schemas
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'information_extraction'
+                  AND table_name = 'extraction_schemas'
+                  AND column_name = 'created_by') THEN
+        ALTER TABLE information_extraction.extraction_schemas ADD COLUMN created_by VARCHAR(255);
+    END IF;
+
+    -- Add created_by to extraction_jobs
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'information_extraction'
+                  AND table_name = 'extraction_jobs'
+                  AND column_name = 'created_by') THEN
+        ALTER TABLE information_extraction.extraction_jobs ADD COLUMN created_by VARCHAR(255);
+    END IF;
+
+    -- Add user_id to upload_logs
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'information_extraction'
+                  AND table_name = 'upload_logs'
+                  AND column_name = 'user_id') THEN
+        ALTER TABLE information_extraction.upload_logs ADD COLUMN user_id VARCHAR(255);
+    END IF;
+
+    -- Add user_email for better user identification
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'information_extraction'
+                  AND table_name = 'upload_logs'
+                  AND column_name = 'user_email') THEN
+        ALTER TABLE information_extraction.upload_logs ADD COLUMN user_email VARCHAR(255);
+    END IF;
+END $$;
+
+-- Migrate databricks_run_id column from INTEGER to BIGINT to support 64-bit run IDs
+DO $$
+BEGIN
+    -- Check if the column exists and is INTEGER type
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+              WHERE table_schema = 'information_extraction'
+              AND table_name = 'extraction_jobs'
+              AND column_name = 'databricks_run_id'
+              AND data_type = 'integer') THEN
+        -- Alter the column type to BIGINT
+        ALTER TABLE information_extraction.extraction_jobs
+        ALTER COLUMN databricks_run_id TYPE BIGINT;
+    END IF;
+END $$;
+
+-- Add file_content_checksum column to extraction_results table if it doesn't exist
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'information_extraction'
+                  AND table_name = 'extraction_results'
+                  AND column_name = 'file_content_checksum') THEN
+        ALTER TABLE information_extraction.extraction_results ADD COLUMN file_content_checksum TEXT;
+    END IF;
+END $$;
+
+-- Store schema fields as JSONB so they can be inspected in SQL
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+              WHERE table_schema = 'information_extraction'
+              AND table_name = 'extraction_schemas'
+              AND column_name = 'fields'
+              AND data_type = 'text') THEN
+        ALTER TABLE information_extraction.extraction_schemas
+        ALTER COLUMN fields TYPE JSONB USING fields::jsonb;
+    END IF;
+END $$;
+
+-- Nothing looks results up by file checksum; don't maintain an index for it
+DROP INDEX IF EXISTS information_extraction.idx_results_checksum;
+
+-- Per-job document count kept up to date by triggers, so job lists don't aggregate documents
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'information_extraction'
+                  AND table_name = 'extraction_jobs'
+                  AND column_name = 'documents_count') THEN
+        ALTER TABLE information_extraction.extraction_jobs
+        ADD COLUMN documents_count INTEGER NOT NULL DEFAULT 0;
+
+        UPDATE information_extraction.extraction_jobs j
+        SET documents_count = d.count
+        FROM (
+            SELECT job_id, COUNT(*) AS count
+            FROM information_extraction.documents
+            GROUP BY job_id
+        ) d
+        WHERE j.id = d.job_id;
+    END IF;
+END $$;
+
+CREATE OR REPLACE FUNCTION information_extraction.bump_documents_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE information_extraction.extraction_jobs j
+        SET documents_count = j.documents_count + d.count
+        FROM (SELECT job_id, COUNT(*) AS count FROM new_documents GROUP BY job_id) d
+        WHERE j.id = d.job_id;
+    ELSE
+        UPDATE information_extraction.extraction_jobs j
+        SET documents_count = j.documents_count - d.count
+        FROM (SELECT job_id, COUNT(*) AS count FROM old_documents GROUP BY job_id) d
+        WHERE j.id = d.job_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level so a bulk insert updates each job row once
+DROP TRIGGER IF EXISTS documents_count_insert ON information_extraction.documents;
+CREATE TRIGGER documents_count_insert
+    AFTER INSERT ON information_extraction.documents
+    REFERENCING NEW TABLE AS new_documents
+    FOR EACH STATEMENT EXECUTE FUNCTION information_extraction.bump_documents_count();
+
+DROP TRIGGER IF EXISTS documents_count_delete ON information_extraction.documents;
+CREATE TRIGGER documents_count_delete
+    AFTER DELETE ON information_extraction.documents
+    REFERENCING OLD TABLE AS old_documents
+    FOR EACH STATEMENT EXECUTE FUNCTION information_extraction.bump_documents_count();
+
+-- Job lists no longer count documents, so the covering index for that is unused
+DROP INDEX IF EXISTS information_extraction.idx_documents_job_id_inc;
+
+-- Migrate SERIAL ids and the columns referencing them from INTEGER to BIGINT, including
+-- the backing sequences, so no table hits the 2^31 limit
+DO $$
+DECLARE
+    col RECORD;
+    seq TEXT;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'information_extraction'
+        AND data_type = 'integer'
+        AND (table_name, column_name) IN (
+            ('extraction_schemas', 'id'),
+            ('extraction_jobs', 'id'),
+            ('extraction_jobs', 'schema_id'),
+            ('documents', 'id'),
+            ('documents', 'job_id'),
+            ('extraction_results', 'id'),
+            ('extraction_results', 'job_id'),
+            ('extraction_results', 'document_id'),
+            ('extraction_results', 'schema_id'),
+            ('upload_logs', 'id'),
+            ('upload_logs', 'analysis_id')
+        )
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE information_extraction.%I ALTER COLUMN %I TYPE BIGINT',
+            col.table_name, col.column_name
+        );
+        seq := pg_get_serial_sequence(
+            format('information_extraction.%I', col.table_name), col.column_name
+        );
+        IF seq IS NOT NULL THEN
+            EXECUTE format('ALTER SEQUENCE %s AS BIGINT', seq);
+        END IF;
+    END LOOP;
+END $$;
+
+-- Key extraction_results by (job_id, document_id, schema_id), which every upsert targets,
+-- instead of a surrogate id that nothing looks up
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+              WHERE table_schema = 'information_extraction'
+              AND table_name = 'extraction_results'
+              AND column_name = 'id') THEN
+        ALTER TABLE information_extraction.extraction_results
+        DROP CONSTRAINT extraction_results_pkey,
+        DROP COLUMN id,
+        DROP CONSTRAINT IF EXISTS unique_job_document_schema,
+        ADD PRIMARY KEY (job_id, document_id, schema_id);
+    END IF;
+END $$;
+
+-- Covered by the extraction_results primary key
+DROP INDEX IF EXISTS information_extraction.idx_results_job_id;
+
+-- confidence_scores is only written by the app, always as valid JSON, so it is stored as
+-- JSONB. extracted_data stays TEXT: it holds raw LLM output from the Databricks notebook,
+-- which is not guaranteed to be valid JSON.
+CREATE OR REPLACE FUNCTION information_extraction.try_parse_jsonb(value TEXT) RETURNS JSONB AS $$
+BEGIN
+    RETURN value::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+              WHERE table_schema = 'information_extraction'
+              AND table_name = 'extraction_results'
+              AND column_name = 'confidence_scores'
+              AND data_type = 'text') THEN
+        ALTER TABLE information_extraction.extraction_results
+        ALTER COLUMN confidence_scores TYPE JSONB
+        USING information_extraction.try_parse_jsonb(confidence_scores);
+    END IF;
+END $$;
+
+-- Per-job listings filter on job_id and sort newest first; these serve both the filter
+-- and the ORDER BY without a sort node. idx_documents_job_id is a prefix of the new index.
+CREATE INDEX IF NOT EXISTS idx_results_job_created
+    ON information_extraction.extraction_results (job_id, created_at DESC);
+-- file_size is included for the dashboard's per-job document totals (index-only scan)
+CREATE INDEX IF NOT EXISTS idx_documents_job_upload_size
+    ON information_extraction.documents (job_id, upload_time DESC) INCLUDE (file_size);
+DROP INDEX IF EXISTS information_extraction.idx_documents_job_id;
+DROP INDEX IF EXISTS information_extraction.idx_documents_job_upload;
+
+-- Deleting a job removes its documents and results in the same statement
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_constraint
+              WHERE conrelid = 'information_extraction.documents'::regclass
+              AND conname = 'documents_job_id_fkey'
+              AND confdeltype <> 'c') THEN
+        ALTER TABLE information_extraction.documents
+        DROP CONSTRAINT documents_job_id_fkey,
+        ADD CONSTRAINT documents_job_id_fkey FOREIGN KEY (job_id)
+            REFERENCES information_extraction.extraction_jobs (id) ON DELETE CASCADE;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM pg_constraint
+              WHERE conrelid = 'information_extraction.extraction_results'::regclass
+              AND conname = 'extraction_results_job_id_fkey'
+              AND confdeltype <> 'c') THEN
+        ALTER TABLE information_extraction.extraction_results
+        DROP CONSTRAINT extraction_results_job_id_fkey,
+        ADD CONSTRAINT extraction_results_job_id_fkey FOREIGN KEY (job_id)
+            REFERENCES information_extraction.extraction_jobs (id) ON DELETE CASCADE;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM pg_constraint
+              WHERE conrelid = 'information_extraction.extraction_results'::regclass
+              AND conname = 'extraction_results_document_id_fkey'
+              AND confdeltype <> 'c') THEN
+        ALTER TABLE information_extraction.extraction_results
+        DROP CONSTRAINT extraction_results_document_id_fkey,
+        ADD CONSTRAINT extraction_results_document_id_fkey FOREIGN KEY (document_id)
+            REFERENCES information_extraction.documents (id) ON DELETE CASCADE;
+    END IF;
+END $$;
+
+-- Dashboard aggregates over the last 30 days, refreshed by GET /dashboard/stats when
+-- stale. The unique index allows REFRESH ... CONCURRENTLY so readers are never blocked.
+CREATE MATERIALIZED VIEW IF NOT EXISTS information_extraction.mv_dashboard_stats AS
+WITH recent_jobs AS (
+    SELECT id, status
+    FROM information_extraction.extraction_jobs
+    WHERE created_at >= NOW() - INTERVAL '30 days'
+),
+job_stats AS (
+    SELECT
+        COUNT(*) AS total_jobs,
+        COUNT(*) FILTER (WHERE status = 'pending') AS pending_jobs,
+        COUNT(*) FILTER (WHERE status = 'processing') AS processing_jobs,
+        COUNT(*) FILTER (WHERE status = 'completed') AS completed_jobs,
+        COUNT(*) FILTER (WHERE status = 'failed') AS failed_jobs
+    FROM recent_jobs
+),
+schema_stats AS (
+    SELECT
+        COUNT(*) AS total_schemas,
+        COUNT(*) FILTER (WHERE is_active) AS active_schemas
+    FROM information_extraction.extraction_schemas
+),
+doc_stats AS (
+    SELECT
+        COUNT(*) AS total_documents,
+        COALESCE(SUM(d.file_size), 0) AS total_file_size
+    FROM information_extraction.documents d
+    JOIN recent_jobs j ON d.job_id = j.id
+),
+result_stats AS (
+    SELECT COUNT(*) AS total_results
+    FROM information_extraction.extraction_results r
+    JOIN recent_jobs j ON r.job_id = j.id
+)
+SELECT
+    1 AS id,
+    NOW() AS refreshed_at,
+    job_stats.*,
+    schema_stats.*,
+    doc_stats.*,
+    result_stats.*
+FROM job_stats, schema_stats, doc_stats, result_stats;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_dashboard_stats_id
+    ON information_extraction.mv_dashboard_stats (id);
+
+-- Recent jobs skew towards pending/processing and recent upload logs towards particular
+-- event types; joint statistics stop the planner assuming these columns are independent
+CREATE STATISTICS IF NOT EXISTS information_extraction.ie_jobs_status_created
+    (dependencies, ndistinct) ON status, created_at
+    FROM information_extraction.extraction_jobs;
+CREATE STATISTICS IF NOT EXISTS information_extraction.ie_upload_logs_event_created
+    (dependencies, ndistinct) ON event_type, created_at
+    FROM information_extraction.upload_logs;
+ANALYZE information_extraction.extraction_jobs;
+ANALYZE information_extraction.upload_logs;
+
+-- Activity feed read by GET /logs: one view per kind of activity (uploads/exports, job
+-- creations, job completions/failures, schema creations), and v_activity over all four.
+-- message/details/user_name exist for filtering; GET /logs reads the raw columns after
+-- them and formats the page's messages itself.
+--
+-- The planner doesn't push ORDER BY ... LIMIT through UNION ALL, so GET /logs reads each
+-- view with its own ORDER BY timestamp DESC, id DESC LIMIT and merges the pieces. Each
+-- view's timestamp is a plain indexed expression, so those reads walk an index from the
+-- newest row and stop once they have enough rows.
+DROP VIEW IF EXISTS information_extraction.v_activity;
+
+CREATE INDEX IF NOT EXISTS idx_upload_logs_created_at
+    ON information_extraction.upload_logs (created_at);
+CREATE INDEX IF NOT EXISTS idx_schemas_created_at
+    ON information_extraction.extraction_schemas (created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished_at
+    ON information_extraction.extraction_jobs ((COALESCE(completed_at, updated_at)))
+    WHERE status IN ('completed', 'failed');
+
+-- File uploads and exports
+CREATE OR REPLACE VIEW information_extraction.v_activity_uploads AS
+    SELECT
+        CONCAT('upload_', id) as id,
+        created_at as timestamp,
+        CASE
+            WHEN event_type = 'export' THEN 'Export'
+            WHEN event_type = 'upload' THEN 'Upload'
+            ELSE 'System'
+        END as activity_type,
+        CASE
+            WHEN event_type = 'export' THEN CONCAT(
+                COALESCE(user_email, user_id, 'System'),
+                ' exported results to ',
+                SUBSTRING(upload_directory FROM '[^/]*$'))
+            WHEN event_type = 'upload' THEN CONCAT(
+                COALESCE(user_email, user_id, 'System'), ' uploaded files for processing')
+            ELSE message
+        END as message,
+        details,
+        COALESCE(user_email, user_id, 'System')::text as user_name,
+        upload_directory as subject,
+        NULL::text as status,
+        NULL::text as schema_name,
+        NULL::integer as documents_count,
+        message as raw_message,
+        details as raw_details
+    FROM information_extraction.upload_logs;
+
+-- Job creation
+CREATE OR REPLACE VIEW information_extraction.v_activity_job_creations AS
+    SELECT
+        CONCAT('job_create_', j.id) as id,
+        j.created_at as timestamp,
+        'Job Creation'::text as activity_type,
+        CONCAT(COALESCE(j.created_by, 'System'), ' created job "', j.name, '"') as message,
+        CONCAT('Schema: ', s.name) as details,
+        COALESCE(j.created_by, 'System')::text as user_name,
+        j.name as subject,
+        j.status,
+        s.name as schema_name,
+        NULL::integer as documents_count,
+        NULL::text as raw_message,
+        NULL::text as raw_details
+    FROM information_extraction.extraction_jobs j
+    LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id;
+
+-- Job completions/failures
+CREATE OR REPLACE VIEW information_extraction.v_activity_job_updates AS
+    SELECT
+        CONCAT('job_status_', j.id) as id,
+        COALESCE(j.completed_at, j.updated_at) as timestamp,
+        CASE
+            WHEN j.status = 'completed' THEN 'Job Completion'
+            WHEN j.status = 'failed' THEN 'Job Failure'
+            ELSE 'Job Update'
+        END as activity_type,
+        CONCAT(
+            'Job "', j.name, '" ', j.status,
+            ' (triggered by ', COALESCE(j.created_by, 'System'), ')') as message,
+        CONCAT(j.documents_count, ' documents processed') as details,
+        COALESCE(j.created_by, 'System')::text as user_name,
+        j.name as subject,
+        j.status,
+        NULL::text as schema_name,
+        j.documents_count,
+        NULL::text as raw_message,
+        NULL::text as raw_details
+    FROM information_extraction.extraction_jobs j
+    WHERE j.status IN ('completed', 'failed');
+
+-- Schema creation
+CREATE OR REPLACE VIEW information_extraction.v_activity_schemas AS
+    SELECT
+        CONCAT('schema_', s.id) as id,
+        s.created_at as timestamp,
+        'Schema Creation'::text as activity_type,
+        CONCAT(COALESCE(s.created_by, 'System'), ' created schema "', s.name, '"') as message,
+        s.description as details,
+        COALESCE(s.created_by, 'System')::text as user_name,
+        s.name as subject,
+        NULL::text as status,
+        NULL::text as schema_name,
+        NULL::integer as documents_count,
+        NULL::text as raw_message,
+        s.description as raw_details
+    FROM information_extraction.extraction_schemas s;
+
+-- Every activity, for counting; pages are read per view (see above)
+CREATE VIEW information_extraction.v_activity AS
+    SELECT * FROM information_extraction.v_activity_uploads
+    UNION ALL
+    SELECT * FROM information_extraction.v_activity_job_creations
+    UNION ALL
+    SELECT * FROM information_extraction.v_activity_job_updates
+    UNION ALL
+    SELECT * FROM information_extraction.v_activity_schemas;
+
+-- Uploads that moved a job to 'submitting'; part of the run trigger's idempotency token
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'information_extraction'
+                  AND table_name = 'extraction_jobs'
+                  AND column_name = 'upload_attempts') THEN
+        ALTER TABLE information_extraction.extraction_jobs
+        ADD COLUMN upload_attempts INTEGER NOT NULL DEFAULT 0;
+    END IF;
+END $$;
+
+-- Applied schema versions, checked by create_tables() to skip this script
+CREATE TABLE IF NOT EXISTS information_extraction.schema_migrations (
+    version INTEGER PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
 
 def create_tables() -> None:
   """Create database tables if they don't exist."""
   logger = logging.getLogger(__name__)
   logger.info('🔧 Starting database initialization...')
 
-  conn = get_db_connection()
   try:
-    with conn.cursor() as cursor:
-      # Create schema if it doesn't exist
-      logger.info('Creating information_extraction schema...')
-      cursor.execute('CREATE SCHEMA IF NOT EXISTS information_extraction')
+    with db_cursor() as cursor:
+      # Serialize initialization across worker processes; held until this transaction ends
+      cursor.execute('SELECT pg_advisory_xact_lock(%s)', (SCHEMA_LOCK_ID,))
+
+      # Skip the DDL entirely when this schema version has already been applied
+      cursor.execute("SELECT to_regclass('information_extraction.schema_migrations') IS NOT NULL")
+      if cursor.fetchone()[0]:
+        cursor.execute(
+          'SELECT 1 FROM information_extraction.schema_migrations WHERE version = %s',
+          (SCHEMA_VERSION,),
+        )
+        if cursor.fetchone():
+          logger.info(f'✅ Database schema already at version {SCHEMA_VERSION}')
+          return
 
-      # Create extraction_schemas table (updated to match notebook expectations)
-      logger.info('Creating extraction_schemas table...')
-      cursor.execute("""
-                CREATE TABLE IF NOT EXISTS information_extraction.extraction_schemas (
-                    id SERIAL PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    description TEXT DEFAULT '',
-                    fields TEXT NOT NULL,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-      # Migrate existing schema_definition column to fields column
-      cursor.execute("""
-                DO $$
-                BEGIN
-                    -- Check if schema_definition column exists and fields doesn't
-                    IF EXISTS (SELECT 1 FROM information_schema.columns
-                              WHERE table_schema = 'information_extraction'
-                              AND table_name = 'extraction_schemas'
-                              AND column_name = 'schema_definition')
-                       AND NOT EXISTS (SELECT 1 FROM information_schema.columns
-                                      WHERE table_schema = 'information_extraction'
-                                      AND table_name = 'extraction_schemas'
-                                      AND column_name = 'fields') THEN
-                        -- Add fields column
-                        ALTER TABLE information_extraction.extraction_schemas ADD COLUMN fields TEXT;
-
-                        -- Copy data from schema_definition to fields
-                        UPDATE information_extraction.extraction_schemas SET fields = schema_definition;
-
-                        -- Make fields NOT NULL
-                        ALTER TABLE information_extraction.extraction_schemas ALTER COLUMN fields SET NOT NULL;
-
-                        -- Drop old column
-                        ALTER TABLE information_extraction.extraction_schemas DROP COLUMN schema_definition;
-                    END IF;
-                END $$;
-            """)
-
-      # Create extraction_jobs table (updated with upload_directory)
-      logger.info('Creating extraction_jobs table...')
-      cursor.execute("""
-                CREATE TABLE IF NOT EXISTS information_extraction.extraction_jobs (
-                    id SERIAL PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    schema_id INTEGER NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'not_submitted',
-                    upload_directory TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TIMESTAMP,
-                    error_message TEXT,
-                    databricks_run_id BIGINT,
-                    FOREIGN KEY (schema_id) REFERENCES information_extraction.extraction_schemas (id)
-                )
-            """)
-
-      # === TABLE CREATION FIRST ===
-
-      # Create documents table
-      cursor.execute("""
-                CREATE TABLE IF NOT EXISTS information_extraction.documents (
-                    id SERIAL PRIMARY KEY,
-                    job_id INTEGER NOT NULL,
-                    filename TEXT NOT NULL,
-                    file_path TEXT NOT NULL,
-                    file_size INTEGER NOT NULL,
-                    upload_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (job_id) REFERENCES information_extraction.extraction_jobs (id)
-                )
-            """)
-
-      # Create extraction_results table
-      cursor.execute("""
-                CREATE TABLE IF NOT EXISTS information_extraction.extraction_results (
-                    id SERIAL PRIMARY KEY,
-                    job_id INTEGER NOT NULL,
-                    document_id INTEGER NOT NULL,
-                    schema_id INTEGER NOT NULL,
-                    extracted_data TEXT NOT NULL,
-                    confidence_scores TEXT,
-                    file_content_checksum TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (job_id) REFERENCES information_extraction.extraction_jobs (id),
-                    FOREIGN KEY (document_id) REFERENCES information_extraction.documents (id),
-                    FOREIGN KEY (schema_id) REFERENCES information_extraction.extraction_schemas (id)
-                )
-            """)
-
-      # Create upload_logs table (required by notebook)
-      cursor.execute("""
-                CREATE TABLE IF NOT EXISTS information_extraction.upload_logs (
-                    id SERIAL PRIMARY KEY,
-                    analysis_id INTEGER NOT NULL,
-                    upload_directory TEXT NOT NULL,
-                    event_type TEXT DEFAULT 'upload',
-                    message TEXT,
-                    details TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (analysis_id) REFERENCES information_extraction.extraction_jobs (id)
-                )
-            """)
-
-      # Create indexes for better performance
+      # Tables, indexes and migrations in one multi-statement round-trip
+      logger.info('Creating tables, indexes and running migrations...')
+      cursor.execute(SCHEMA_DDL)
       cursor.execute(
-        'CREATE INDEX IF NOT EXISTS idx_jobs_status ON information_extraction.extraction_jobs (status)'
+        'INSERT INTO information_extraction.schema_migrations (version) VALUES (%s) '
+        'ON CONFLICT DO NOTHING',
+        (SCHEMA_VERSION,),
       )
-      cursor.execute(
-        'CREATE INDEX IF NOT EXISTS idx_jobs_schema_id ON information_extraction.extraction_jobs (schema_id)'
-      )
-      cursor.execute(
-        'CREATE INDEX IF NOT EXISTS idx_documents_job_id ON information_extraction.documents (job_id)'
-      )
-      cursor.execute(
-        'CREATE INDEX IF NOT EXISTS idx_results_job_id ON information_extraction.extraction_results (job_id)'
-      )
-      cursor.execute(
-        'CREATE INDEX IF NOT EXISTS idx_upload_logs_analysis_id ON information_extraction.upload_logs (analysis_id)'
-      )
-
-      # === DATABASE MIGRATIONS (Run after all tables are created) ===
-      logger.info('🔄 Running database migrations after table creation...')
 
-      # Add upload_directory column to extraction_jobs if it doesn't exist
-      logger.info('🔄 Adding upload_directory column to extraction_jobs...')
-      cursor.execute("""
-                DO $$
-                BEGIN
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
-                                  WHERE table_schema = 'information_extraction'
-                                  AND table_name = 'extraction_jobs'
-                                  AND column_name = 'upload_directory') THEN
-                        ALTER TABLE information_extraction.extraction_jobs ADD COLUMN upload_directory TEXT;
-                    END IF;
-                END $$;
-            """)
-
-      # Add user tracking columns for auditing
-      logger.info('🔄 Adding user tracking columns for audit trail...')
-      cursor.execute("""
-                DO $$
-                BEGIN
-                    -- Add created_by to extraction_schemas
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
-                                  WHERE table_schema = 'information_extraction'
-                                  AND table_name = 'extraction_schemas'
-                                  AND column_name = 'created_by') THEN
-                        ALTER TABLE information_extraction.extraction_schemas ADD COLUMN created_by VARCHAR(255);
-                    END IF;
-
-                    -- Add created_by to extraction_jobs
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
-                                  WHERE table_schema = 'information_extraction'
-                                  AND table_name = 'extraction_jobs'
-                                  AND column_name = 'created_by') THEN
-                        ALTER TABLE information_extraction.extraction_jobs ADD COLUMN created_by VARCHAR(255);
-                    END IF;
-
-                    -- Add user_id to upload_logs
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
-                                  WHERE table_schema = 'information_extraction'
-                                  AND table_name = 'upload_logs'
-                                  AND column_name = 'user_id') THEN
-                        ALTER TABLE information_extraction.upload_logs ADD COLUMN user_id VARCHAR(255);
-                    END IF;
-
-                    -- Add user_email for better user identification
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
-                                  WHERE table_schema = 'information_extraction'
-                                  AND table_name = 'upload_logs'
-                                  AND column_name = 'user_email') THEN
-                        ALTER TABLE information_extraction.upload_logs ADD COLUMN user_email VARCHAR(255);
-                    END IF;
-                END $$;
-            """)
-
-      # Migrate databricks_run_id column from INTEGER to BIGINT to support 64-bit run IDs
-      logger.info('🔄 Migrating databricks_run_id column from INTEGER to BIGINT...')
-      cursor.execute("""
-                DO $$
-                BEGIN
-                    -- Check if the column exists and is INTEGER type
-                    IF EXISTS (SELECT 1 FROM information_schema.columns
-                              WHERE table_schema = 'information_extraction'
-                              AND table_name = 'extraction_jobs'
-                              AND column_name = 'databricks_run_id'
-                              AND data_type = 'integer') THEN
-                        -- Alter the column type to BIGINT
-                        ALTER TABLE information_extraction.extraction_jobs
-                        ALTER COLUMN databricks_run_id TYPE BIGINT;
-                    END IF;
-                END $$;
-            """)
-
-      # Add file_content_checksum column to extraction_results table if it doesn't exist
-      logger.info('🔄 Adding file_content_checksum column to extraction_results...')
-      cursor.execute("""
-                DO $$
-                BEGIN
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
-                                  WHERE table_schema = 'information_extraction'
-                                  AND table_name = 'extraction_results'
-                                  AND column_name = 'file_content_checksum') THEN
-                        ALTER TABLE information_extraction.extraction_results ADD COLUMN file_content_checksum TEXT;
-                    END IF;
-                END $$;
-            """)
-
-      # Add unique constraint for upsert operations (job_id, document_id, schema_id)
-      logger.info('🔄 Adding unique constraint for extraction_results upsert operations...')
-      cursor.execute("""
-                DO $$
-                BEGIN
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.table_constraints
-                                  WHERE table_schema = 'information_extraction'
-                                  AND table_name = 'extraction_results'
-                                  AND constraint_name = 'unique_job_document_schema') THEN
-                        ALTER TABLE information_extraction.extraction_results
-                        ADD CONSTRAINT unique_job_document_schema
-                        UNIQUE (job_id, document_id, schema_id);
-                    END IF;
-                END $$;
-            """)
-
-      conn.commit()
-      logger.info('✅ Database initialization completed successfully!')
-      logger.info('✅ BIGINT migration for databricks_run_id completed!')
+    logger.info('✅ Database initialization completed successfully!')
   except Exception as e:
     logger.error(f'❌ Database initialization failed: {str(e)}')
     logger.error(f'❌ Full traceback: {traceback.format_exc()}')
-    conn.rollback()
     raise
-  finally:
-    return_db_connection(conn)
 
 
 def test_db_connection() -> bool:
   """Test database connection."""
   try:
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
+    with db_cursor() as cursor:
       cursor.execute('SELECT 1')
-      result = cursor.fetchone()
-    return_db_connection(conn)
-    return result[0] == 1
+      return cursor.fetchone()[0] == 1
   except Exception:
     return False
 
@@ -355,138 +947,148 @@ def test_db_connection() -> bool:
 
 def create_extraction_schema(schema: DBExtractionSchema, created_by: str = 'System') -> int:
   """Create a new extraction schema and return its ID."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor() as cursor:
-      cursor.execute(
-        """
-                INSERT INTO information_extraction.extraction_schemas (name, description, fields, is_active, created_by)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id
-            """,
-        (schema.name, schema.description, schema.fields, schema.is_active, created_by),
-      )
-      schema_id = cursor.fetchone()[0]
-      conn.commit()
-      return schema_id
-  finally:
-    return_db_connection(conn)
+  with db_cursor() as cursor:
+    cursor.execute(
+      """
+              INSERT INTO information_extraction.extraction_schemas
+                  (name, description, fields, is_active, created_by)
+              VALUES (%s, %s, %s, %s, %s)
+              RETURNING id
+          """,
+      (schema.name, schema.description, schema.fields, schema.is_active, created_by),
+    )
+    schema_id = cursor.fetchone()[0]
+    return schema_id
+
+
+# Schemas are read far more often than written, so lookups by ID are cached in-process.
+# Updates and deletes in this process evict the entry; changes made elsewhere are picked
+# up once the entry expires. The app runs as a single uvicorn worker (app.yaml) so every
+# edit made through the API is seen by the process that caches it.
+SCHEMA_CACHE_TTL_SECONDS = 60
+_schema_cache: Dict[int, Tuple[float, ExtractionSchema]] = {}
+_schema_cache_lock = threading.Lock()
+# Bumped on every invalidation, so a read that raced with an update can't put the
+# pre-update schema back into the cache
+_schema_cache_versions: Dict[int, int] = {}
+
+
+def _invalidate_schema_cache(schema_id: int) -> None:
+  """Drop a schema from the in-process cache."""
+  with _schema_cache_lock:
+    _schema_cache.pop(schema_id, None)
+    _schema_cache_versions[schema_id] = _schema_cache_versions.get(schema_id, 0) + 1
 
 
 def get_extraction_schema(schema_id: int) -> Optional[ExtractionSchema]:
-  """Get extraction schema by ID."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-      cursor.execute(
-        """
-                SELECT id, name, description, fields, is_active, created_at
-                FROM information_extraction.extraction_schemas
-                WHERE id = %s
-            """,
-        (schema_id,),
+  """Get extraction schema by ID, cached for SCHEMA_CACHE_TTL_SECONDS."""
+  now = time.monotonic()
+  with _schema_cache_lock:
+    cached = _schema_cache.get(schema_id)
+    version = _schema_cache_versions.get(schema_id, 0)
+  if cached is not None and now - cached[0] < SCHEMA_CACHE_TTL_SECONDS:
+    return cached[1]
+
+  schema = _fetch_extraction_schema(schema_id)
+  if schema is not None:
+    with _schema_cache_lock:
+      if _schema_cache_versions.get(schema_id, 0) == version:
+        _schema_cache[schema_id] = (now, schema)
+  return schema
+
+
+# Built once; parses and validates a whole fields list in a single call
+_SCHEMA_FIELDS_ADAPTER = TypeAdapter(List[SchemaField])
+
+
+def _fetch_extraction_schema(schema_id: int) -> Optional[ExtractionSchema]:
+  """Load extraction schema by ID from the database."""
+  with db_cursor() as cursor:
+    execute_prepared(cursor, 'get_extraction_schema', (schema_id,))
+    row = cursor.fetchone()
+    if row:
+      id_, name, description, fields_json, is_active, created_at = row
+      return ExtractionSchema(
+        id=id_,
+        name=name,
+        description=description,
+        # Fields arrive as JSON text and go straight to pydantic-core, skipping the
+        # intermediate dicts a decoded JSONB value would be built into
+        fields=_SCHEMA_FIELDS_ADAPTER.validate_json(fields_json),
+        is_active=is_active,
+        created_at=created_at,
       )
-      row = cursor.fetchone()
-      if row:
-        fields = json.loads(row['fields'])
-        return ExtractionSchema(
-          id=row['id'],
-          name=row['name'],
-          description=row['description'],
-          fields=[SchemaField(**field) for field in fields],
-          is_active=row['is_active'],
-          created_at=row['created_at'],
-        )
-      return None
-  finally:
-    return_db_connection(conn)
+    return None
 
 
 def get_all_extraction_schemas() -> List[ExtractionSchemaSummary]:
   """Get all extraction schemas with summary information."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-      cursor.execute("""
-                SELECT
-                    id,
-                    name,
-                    description,
-                    fields,
-                    is_active,
-                    created_at
-                FROM information_extraction.extraction_schemas
-                ORDER BY created_at DESC
-            """)
-      rows = cursor.fetchall()
-      schemas = []
-      for row in rows:
-        fields = json.loads(row['fields'])
-        schemas.append(
-          ExtractionSchemaSummary(
-            id=row['id'],
-            name=row['name'],
-            description=row['description'],
-            fields_count=len(fields),
-            is_active=row['is_active'],
-            created_at=row['created_at'],
-          )
-        )
-      return schemas
-  finally:
-    return_db_connection(conn)
+  with db_cursor() as cursor:
+    cursor.execute("""
+              SELECT
+                  id,
+                  name,
+                  description,
+                  jsonb_array_length(fields) AS fields_count,
+                  is_active,
+                  created_at
+              FROM information_extraction.extraction_schemas
+              ORDER BY created_at DESC
+          """)
+    return [
+      ExtractionSchemaSummary(
+        id=id_,
+        name=name,
+        description=description,
+        fields_count=fields_count,
+        is_active=is_active,
+        created_at=created_at,
+      )
+      for id_, name, description, fields_count, is_active, created_at in cursor.fetchall()
+    ]
 
 
-def update_extraction_schema(schema_id: int, updates: Dict[str, Any]) -> bool:
-  """Update extraction schema."""
-  if not updates:
-    return False
+def _update_params(updates: Dict[str, Any], columns: Sequence[str]) -> List[Any]:
+  """Flatten updates into the (is set, value) parameter pairs of a fixed UPDATE statement."""
+  params = []
+  for column in columns:
+    params += [column in updates, updates.get(column)]
+  return params
 
-  conn = get_db_connection()
-  try:
-    with conn.cursor() as cursor:
-      set_clauses = []
-      values = []
 
-      for key, value in updates.items():
-        if key in ['name', 'description', 'fields', 'is_active']:
-          set_clauses.append(f'{key} = %s')
-          values.append(value)
+# Columns accepted by update_extraction_schema, in the order of its UPDATE statement
+SCHEMA_UPDATE_COLUMNS = ('name', 'description', 'fields', 'is_active')
 
-      if not set_clauses:
-        return False
 
-      values.append(schema_id)
+def update_extraction_schema(schema_id: int, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+  """Update extraction schema and return the updated row, or None if it doesn't exist."""
+  if not any(key in SCHEMA_UPDATE_COLUMNS for key in updates):
+    return None
 
-      cursor.execute(
-        f"""
-                UPDATE information_extraction.extraction_schemas
-                SET {', '.join(set_clauses)}
-                WHERE id = %s
-            """,
-        values,
-      )
+  with db_cursor(dict_rows=True) as cursor:
+    execute_prepared(
+      cursor,
+      'update_extraction_schema',
+      (*_update_params(updates, SCHEMA_UPDATE_COLUMNS), schema_id),
+    )
 
-      affected_rows = cursor.rowcount
-      conn.commit()
-      return affected_rows > 0
-  finally:
-    return_db_connection(conn)
+    row = cursor.fetchone()
+
+  # Evict only once the change is committed
+  _invalidate_schema_cache(schema_id)
+  return dict(row) if row else None
 
 
 def delete_extraction_schema(schema_id: int) -> bool:
   """Delete extraction schema."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor() as cursor:
-      cursor.execute(
-        'DELETE FROM information_extraction.extraction_schemas WHERE id = %s', (schema_id,)
-      )
-      affected_rows = cursor.rowcount
-      conn.commit()
-      return affected_rows > 0
-  finally:
-    return_db_connection(conn)
+  with db_cursor() as cursor:
+    cursor.execute(
+      'DELETE FROM information_extraction.extraction_schemas WHERE id = %s', (schema_id,)
+    )
+    affected_rows = cursor.rowcount
+
+  _invalidate_schema_cache(schema_id)
+  return affected_rows > 0
 
 
 # ============================================================================
@@ -496,200 +1098,223 @@ def delete_extraction_schema(schema_id: int) -> bool:
 
 def create_extraction_job(job: DBExtractionJob, created_by: str = 'System') -> int:
   """Create a new extraction job and return its ID."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor() as cursor:
-      cursor.execute(
-        """
-                INSERT INTO information_extraction.extraction_jobs (name, schema_id, status, created_by)
-                VALUES (%s, %s, %s, %s)
-                RETURNING id
-            """,
-        (job.name, job.schema_id, job.status, created_by),
-      )
-      job_id = cursor.fetchone()[0]
-      conn.commit()
-      return job_id
-  finally:
-    return_db_connection(conn)
+  with db_cursor() as cursor:
+    cursor.execute(
+      """
+              INSERT INTO information_extraction.extraction_jobs
+                  (name, schema_id, status, created_by)
+              VALUES (%s, %s, %s, %s)
+              RETURNING id
+          """,
+      (job.name, job.schema_id, job.status, created_by),
+    )
+    job_id = cursor.fetchone()[0]
+    return job_id
 
 
 def get_extraction_job(job_id: int) -> Optional[ExtractionJob]:
   """Get extraction job by ID."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-      cursor.execute(
-        """
-                SELECT id, name, schema_id, status, created_at, updated_at,
-                       completed_at, error_message, databricks_run_id
-                FROM information_extraction.extraction_jobs
-                WHERE id = %s
-            """,
-        (job_id,),
-      )
-      row = cursor.fetchone()
-      if row:
-        return ExtractionJob(**dict(row))
-      return None
-  finally:
-    return_db_connection(conn)
+  with db_cursor(dict_rows=True) as cursor:
+    execute_prepared(cursor, 'get_extraction_job', (job_id,))
+    row = cursor.fetchone()
+    if row:
+      return ExtractionJob(**row)
+    return None
 
 
 def get_extraction_job_with_schema(job_id: int) -> Optional[Dict[str, Any]]:
   """Get extraction job by ID with schema name included."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-      cursor.execute(
-        """
-                SELECT j.id, j.name, j.schema_id, j.status, j.created_at, j.updated_at,
-                       j.completed_at, j.error_message, j.databricks_run_id,
-                       s.name as schema_name
-                FROM information_extraction.extraction_jobs j
-                LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id
-                WHERE j.id = %s
-            """,
-        (job_id,),
-      )
-      row = cursor.fetchone()
-      if row:
-        return dict(row)
-      return None
-  finally:
-    return_db_connection(conn)
+  with db_cursor(dict_rows=True) as cursor:
+    execute_prepared(cursor, 'get_extraction_job_with_schema', (job_id,))
+    row = cursor.fetchone()
+    if row:
+      return dict(row)
+    return None
 
 
 def get_all_extraction_jobs() -> List[Dict[str, Any]]:
   """Get all extraction jobs with schema names and proper status logic."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-      cursor.execute("""
-                SELECT
-                    j.id,
-                    j.name,
-                    j.status,
-                    j.databricks_run_id,
-                    j.created_at,
-                    j.completed_at,
-                    s.name as schema_name,
-                    COALESCE(doc_count.count, 0) as documents_count,
-                    -- Calculate proper status based on databricks_run_id
-                    CASE
-                        WHEN j.databricks_run_id IS NULL AND j.status NOT IN ('failed', 'uploaded')
-                        THEN 'not_submitted'
-                        ELSE j.status
-                    END as computed_status
-                FROM information_extraction.extraction_jobs j
-                LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id
-                LEFT JOIN (
-                    SELECT job_id, COUNT(*) as count
-                    FROM information_extraction.documents
-                    GROUP BY job_id
-                ) doc_count ON j.id = doc_count.job_id
-                ORDER BY j.created_at DESC
-            """)
-
-      # Convert to list and update status to computed_status
-      jobs = []
-      for row in cursor.fetchall():
-        job_dict = dict(row)
-        job_dict['status'] = job_dict['computed_status']  # Use computed status
-        del job_dict['computed_status']  # Remove computed field
-        jobs.append(job_dict)
-
-      return jobs
-  finally:
-    return_db_connection(conn)
+  with db_cursor(dict_rows=True) as cursor:
+    cursor.execute("""
+              SELECT
+                  j.id,
+                  j.name,
+                  -- Calculate proper status based on databricks_run_id
+                  CASE
+                      WHEN j.databricks_run_id IS NULL
+                          AND j.status NOT IN ('failed', 'uploaded', 'submitting')
+                      THEN 'not_submitted'
+                      ELSE j.status
+                  END as status,
+                  j.databricks_run_id,
+                  j.created_at,
+                  j.completed_at,
+                  s.name as schema_name,
+                  j.documents_count
+              FROM information_extraction.extraction_jobs j
+              LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id
+              ORDER BY j.created_at DESC
+          """)
+
+    return cursor.fetchall()
 
 
 def get_extraction_jobs_by_schema(schema_id: int) -> List[Dict[str, Any]]:
-  """Get all extraction jobs for a specific schema ID."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-      cursor.execute(
-        """
-                SELECT
-                    j.id,
-                    j.name,
-                    j.status,
-                    j.databricks_run_id,
-                    j.created_at,
-                    j.completed_at,
-                    s.name as schema_name,
-                    COALESCE(doc_count.count, 0) as documents_count,
-                    -- Calculate proper status based on databricks_run_id
-                    CASE
-                        WHEN j.databricks_run_id IS NULL AND j.status NOT IN ('failed', 'uploaded')
-                        THEN 'not_submitted'
-                        ELSE j.status
-                    END as computed_status
-                FROM information_extraction.extraction_jobs j
-                LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id
-                LEFT JOIN (
-                    SELECT job_id, COUNT(*) as count
-                    FROM information_extraction.documents
-                    GROUP BY job_id
-                ) doc_count ON j.id = doc_count.job_id
-                WHERE j.schema_id = %s
-                ORDER BY j.created_at DESC
-            """,
-        (schema_id,),
-      )
-
-      # Convert to list and update status to computed_status
-      jobs = []
-      for row in cursor.fetchall():
-        job_dict = dict(row)
-        job_dict['status'] = job_dict['computed_status']  # Use computed status
-        del job_dict['computed_status']  # Remove computed field
-        jobs.append(job_dict)
-
-      return jobs
-  finally:
-    return_db_connection(conn)
+  """Get all extraction jobs for a specific schema ID, shaped as ExtractionJobSummary rows."""
+  with db_cursor(dict_rows=True) as cursor:
+    cursor.execute(
+      """
+              SELECT
+                  j.id,
+                  j.name,
+                  -- Calculate proper status based on databricks_run_id
+                  CASE
+                      WHEN j.databricks_run_id IS NULL
+                          AND j.status NOT IN ('failed', 'uploaded', 'submitting')
+                      THEN 'not_submitted'
+                      ELSE j.status
+                  END as status,
+                  j.created_at,
+                  j.completed_at,
+                  s.name as schema_name,
+                  j.documents_count
+              FROM information_extraction.extraction_jobs j
+              LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id
+              WHERE j.schema_id = %s
+              ORDER BY j.created_at DESC
+          """,
+      (schema_id,),
+    )
 
+    return cursor.fetchall()
 
-def update_extraction_job(job_id: int, updates: Dict[str, Any]) -> bool:
-  """Update extraction job."""
-  if not updates:
-    return False
-
-  conn = get_db_connection()
-  try:
-    with conn.cursor() as cursor:
-      set_clauses = []
-      values = []
 
-      # Always update updated_at when making changes
-      set_clauses.append('updated_at = CURRENT_TIMESTAMP')
+# Columns accepted by update_extraction_job, in the order of its UPDATE statement
+JOB_UPDATE_COLUMNS = (
+  'name',
+  'schema_id',
+  'status',
+  'upload_directory',
+  'databricks_run_id',
+  'completed_at',
+  'error_message',
+  'created_by',
+)
 
-      # Exclude only protected/system fields that shouldn't be directly updated
-      protected_fields = {'id', 'created_at', 'updated_at'}
 
-      for key, value in updates.items():
-        if key not in protected_fields:
-          set_clauses.append(f'{key} = %s')
-          values.append(value)
+def update_extraction_job(job_id: int, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+  """Update extraction job and return the updated row, or None if it doesn't exist."""
+  if not updates:
+    return None
+
+  # Exclude only protected/system fields that shouldn't be directly updated
+  protected_fields = {'id', 'created_at', 'updated_at'}
+  unknown_fields = set(updates) - protected_fields - set(JOB_UPDATE_COLUMNS)
+  if unknown_fields:
+    raise ValueError(f'Cannot update unknown job columns: {sorted(unknown_fields)}')
+
+  with db_cursor(dict_rows=True) as cursor:
+    execute_prepared(
+      cursor,
+      'update_extraction_job',
+      (*_update_params(updates, JOB_UPDATE_COLUMNS), job_id),
+    )
 
-      values.append(job_id)
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+
+def set_extraction_job_status(
+  job_id: int, status: str, error_message: Optional[str] = None
+) -> bool:
+  """Move a job to ``status`` and return whether it changed.
+
+  The write is skipped in SQL when the job is already in that status, so repeated status
+  polls, or several workers seeing the same transition, don't rewrite the row. A job that
+  is 'submitting' is left alone: a poll of its previous run must not move it.
+  """
+  with db_cursor() as cursor:
+    cursor.execute(
+      """
+              UPDATE information_extraction.extraction_jobs
+              SET status = %s,
+                  error_message = COALESCE(%s, error_message),
+                  updated_at = CURRENT_TIMESTAMP
+              WHERE id = %s AND status IS DISTINCT FROM %s AND status <> 'submitting'
+          """,
+      (status, error_message, job_id, status),
+    )
+    return cursor.rowcount > 0
+
+
+# Job statuses that accept a new upload
+UPLOADABLE_JOB_STATUSES = ('not_submitted', 'uploaded', 'failed')
+
+
+def claim_extraction_job_submission(job_id: int, upload_directory: str) -> Optional[int]:
+  """Move an uploadable job to 'submitting' and return its new upload attempt number.
+
+  The previous run's ID, error and completion time are cleared, so nothing about the
+  earlier attempt is reported while this one is submitted. Returns None when the job no
+  longer accepts uploads, e.g. because a concurrent upload claimed it first.
+  """
+  with db_cursor() as cursor:
+    cursor.execute(
+      """
+              UPDATE information_extraction.extraction_jobs
+              SET status = 'submitting',
+                  upload_directory = %s,
+                  upload_attempts = upload_attempts + 1,
+                  databricks_run_id = NULL,
+                  error_message = NULL,
+                  completed_at = NULL,
+                  updated_at = CURRENT_TIMESTAMP
+              WHERE id = %s AND status IN %s
+              RETURNING upload_attempts
+          """,
+      (upload_directory, job_id, UPLOADABLE_JOB_STATUSES),
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def end_extraction_job_submission(
+  job_id: int,
+  upload_attempt: int,
+  status: str,
+  databricks_run_id: Optional[int] = None,
+  error_message: Optional[str] = None,
+) -> bool:
+  """Move a job out of 'submitting' for ``upload_attempt`` and return whether it moved.
+
+  Nothing is written when the job has since left 'submitting' or been claimed by a later
+  upload, so a slow trigger can't overwrite a newer attempt's state.
+  """
+  with db_cursor() as cursor:
+    cursor.execute(
+      """
+              UPDATE information_extraction.extraction_jobs
+              SET status = %s,
+                  databricks_run_id = %s,
+                  error_message = %s,
+                  updated_at = CURRENT_TIMESTAMP
+              WHERE id = %s AND status = 'submitting' AND upload_attempts = %s
+          """,
+      (status, databricks_run_id, error_message, job_id, upload_attempt),
+    )
+    return cursor.rowcount > 0
 
-      cursor.execute(
-        f"""
-                UPDATE information_extraction.extraction_jobs
-                SET {', '.join(set_clauses)}
-                WHERE id = %s
-            """,
-        values,
-      )
 
-      affected_rows = cursor.rowcount
-      conn.commit()
-      return affected_rows > 0
-  finally:
-    return_db_connection(conn)
+def get_submitting_extraction_jobs() -> List[Dict[str, Any]]:
+  """Get jobs whose Databricks run was being started, with their upload attempt numbers."""
+  with db_cursor(dict_rows=True) as cursor:
+    cursor.execute("""
+              SELECT id, schema_id, upload_attempts
+              FROM information_extraction.extraction_jobs
+              WHERE status = 'submitting'
+              ORDER BY id
+          """)
+    return cursor.fetchall()
 
 
 # ============================================================================
@@ -699,41 +1324,83 @@ def update_extraction_job(job_id: int, updates: Dict[str, Any]) -> bool:
 
 def create_document(document: DBDocument) -> int:
   """Create a new document record and return its ID."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor() as cursor:
-      cursor.execute(
+  with db_cursor() as cursor:
+    cursor.execute(
+      """
+              INSERT INTO information_extraction.documents (job_id, filename, file_path, file_size)
+              VALUES (%s, %s, %s, %s)
+              RETURNING id
+          """,
+      (document.job_id, document.filename, document.file_path, document.file_size),
+    )
+    document_id = cursor.fetchone()[0]
+    return document_id
+
+
+def create_documents_bulk(documents: List[DBDocument]) -> List[int]:
+  """Create several document records and return their IDs in input order.
+
+  Typical uploads go through one multi-row INSERT; batches of COPY_MIN_ROWS or more are
+  streamed into a temporary staging table with COPY and moved into documents with a
+  single INSERT ... SELECT. Either way the batch costs a fixed number of round trips.
+  """
+  if not documents:
+    return []
+
+  with db_cursor() as cursor:
+    if len(documents) < COPY_MIN_ROWS:
+      inserted = execute_values(
+        cursor,
         """
-                INSERT INTO information_extraction.documents (job_id, filename, file_path, file_size)
-                VALUES (%s, %s, %s, %s)
-                RETURNING id
-            """,
-        (document.job_id, document.filename, document.file_path, document.file_size),
+              INSERT INTO information_extraction.documents (job_id, filename, file_path, file_size)
+              VALUES %s
+              RETURNING id
+          """,
+        [(d.job_id, d.filename, d.file_path, d.file_size) for d in documents],
+        page_size=BULK_INSERT_PAGE_SIZE,
+        fetch=True,
       )
-      document_id = cursor.fetchone()[0]
-      conn.commit()
-      return document_id
-  finally:
-    return_db_connection(conn)
+    else:
+      cursor.execute("""
+              CREATE TEMP TABLE documents_staging (
+                  position INTEGER,
+                  job_id BIGINT,
+                  filename TEXT,
+                  file_path TEXT,
+                  file_size INTEGER
+              ) ON COMMIT DROP
+          """)
+      copy_rows(
+        cursor,
+        'documents_staging',
+        ('position', 'job_id', 'filename', 'file_path', 'file_size'),
+        (
+          (position, d.job_id, d.filename, d.file_path, d.file_size)
+          for position, d in enumerate(documents)
+        ),
+      )
+      cursor.execute("""
+              INSERT INTO information_extraction.documents (job_id, filename, file_path, file_size)
+              SELECT job_id, filename, file_path, file_size
+              FROM documents_staging
+              ORDER BY position
+              RETURNING id
+          """)
+      inserted = cursor.fetchall()
+
+    # Identity values are handed out in insertion order, so sorted IDs follow the input
+    return sorted(row[0] for row in inserted)
+
+
+# Built once; validates all of a job's documents in a single call
+_DOCUMENTS_ADAPTER = TypeAdapter(List[Document])
 
 
 def get_documents_by_job(job_id: int) -> List[Document]:
   """Get all documents for a job."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-      cursor.execute(
-        """
-                SELECT id, job_id, filename, file_path, file_size, upload_time
-                FROM information_extraction.documents
-                WHERE job_id = %s
-                ORDER BY upload_time DESC
-            """,
-        (job_id,),
-      )
-      return [Document(**dict(row)) for row in cursor.fetchall()]
-  finally:
-    return_db_connection(conn)
+  with db_cursor(dict_rows=True) as cursor:
+    execute_prepared(cursor, 'get_documents_by_job', (job_id,))
+    return _DOCUMENTS_ADAPTER.validate_python(cursor.fetchall())
 
 
 # ============================================================================
@@ -741,81 +1408,72 @@ def get_documents_by_job(job_id: int) -> List[Document]:
 # ============================================================================
 
 
-def create_extraction_result(result: DBExtractionResult) -> int:
-  """Create a new extraction result and return its ID."""
-  conn = get_db_connection()
+def _parse_json_column(value: Optional[str]) -> Any:
+  """Parse a JSON text column, treating NULL, empty and invalid JSON as an empty dict."""
+  if not value:
+    return {}
   try:
-    with conn.cursor() as cursor:
-      cursor.execute(
-        """
-                INSERT INTO information_extraction.extraction_results
-                (job_id, document_id, schema_id, extracted_data, confidence_scores)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id
-            """,
-        (
-          result.job_id,
-          result.document_id,
-          result.schema_id,
-          result.extracted_data,
-          result.confidence_scores,
-        ),
-      )
-      result_id = cursor.fetchone()[0]
-      conn.commit()
-      return result_id
-  finally:
-    return_db_connection(conn)
-
-
-def get_results_by_job(job_id: int) -> List[Dict[str, Any]]:
-  """Get all extraction results for a job."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-      cursor.execute(
-        """
-                SELECT
-                    r.id,
-                    r.job_id,
-                    r.document_id,
-                    r.schema_id,
-                    r.extracted_data,
-                    r.confidence_scores,
-                    r.created_at,
-                    d.filename as document_filename
-                FROM information_extraction.extraction_results r
-                LEFT JOIN information_extraction.documents d ON r.document_id = d.id
-                WHERE r.job_id = %s
-                ORDER BY r.created_at DESC
-            """,
-        (job_id,),
-      )
-      results = []
-      for row in cursor.fetchall():
-        result_dict = dict(row)
-        # Handle NULL or empty extracted_data
-        if result_dict['extracted_data']:
-          try:
-            result_dict['extracted_data'] = json.loads(result_dict['extracted_data'])
-          except (json.JSONDecodeError, ValueError):
-            result_dict['extracted_data'] = {}
-        else:
-          result_dict['extracted_data'] = {}
-
-        # Handle NULL or empty confidence_scores
-        if result_dict['confidence_scores']:
-          try:
-            result_dict['confidence_scores'] = json.loads(result_dict['confidence_scores'])
-          except (json.JSONDecodeError, ValueError):
-            result_dict['confidence_scores'] = {}
-        else:
-          result_dict['confidence_scores'] = {}
-
-        results.append(result_dict)
-      return results
-  finally:
-    return_db_connection(conn)
+    return orjson.loads(value)
+  except orjson.JSONDecodeError:
+    return {}
+
+
+def iter_results_by_job(
+  job_id: int, limit: Optional[int] = None, offset: int = 0
+) -> Iterator[Dict[str, Any]]:
+  """Yield extraction results for a job, newest first.
+
+  Rows are streamed from a server-side cursor in batches of RESULTS_FETCH_BATCH_SIZE,
+  so memory stays bounded however many results the job has. The connection is held
+  until the iterator is exhausted or closed. Pass ``limit``/``offset`` to fetch one
+  page instead of every result.
+  """
+  with db_cursor(name='results_by_job') as cursor:
+    cursor.itersize = RESULTS_FETCH_BATCH_SIZE
+    cursor.execute(
+      """
+              SELECT
+                  r.job_id,
+                  r.document_id,
+                  r.schema_id,
+                  r.extracted_data,
+                  r.confidence_scores,
+                  r.created_at,
+                  d.filename as document_filename
+              FROM information_extraction.extraction_results r
+              LEFT JOIN information_extraction.documents d ON r.document_id = d.id
+              WHERE r.job_id = %s
+              ORDER BY r.created_at DESC
+              LIMIT %s OFFSET %s
+          """,
+      (job_id, limit, offset),
+    )
+    # Tuple rows: each result dict is built once rather than copied from a RealDictRow
+    for (
+      row_job_id,
+      document_id,
+      schema_id,
+      extracted_data,
+      confidence_scores,
+      created_at,
+      document_filename,
+    ) in cursor:
+      yield {
+        'job_id': row_job_id,
+        'document_id': document_id,
+        'schema_id': schema_id,
+        'extracted_data': _parse_json_column(extracted_data),
+        'confidence_scores': confidence_scores or {},
+        'created_at': created_at,
+        'document_filename': document_filename,
+      }
+
+
+def get_results_by_job(
+  job_id: int, limit: Optional[int] = None, offset: int = 0
+) -> List[Dict[str, Any]]:
+  """Get extraction results for a job, newest first (see iter_results_by_job)."""
+  return list(iter_results_by_job(job_id, limit=limit, offset=offset))
 
 
 # ============================================================================
@@ -833,19 +1491,16 @@ def create_upload_log(
   user_email: str = '',
 ) -> int:
   """Create a new upload log entry and return its ID."""
-  conn = get_db_connection()
-  try:
-    with conn.cursor() as cursor:
-      cursor.execute(
-        """
-                INSERT INTO information_extraction.upload_logs (analysis_id, upload_directory, event_type, message, details, user_id, user_email)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """,
-        (analysis_id, upload_directory, event_type, message, details, user_id, user_email),
-      )
-      log_id = cursor.fetchone()[0]
-      conn.commit()
-      return log_id
-  finally:
-    return_db_connection(conn)
+  with db_cursor() as cursor:
+    cursor.execute(
+      """
+              INSERT INTO information_extraction.upload_logs (
+                  analysis_id, upload_directory, event_type, message, details, user_id, user_email
+              )
+              VALUES (%s, %s, %s, %s, %s, %s, %s)
+              RETURNING id
+          """,
+      (analysis_id, upload_directory, event_type, message, details, user_id, user_email),
+    )
+    log_id = cursor.fetchone()[0]
+    return log_id
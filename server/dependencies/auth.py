@@ -1,7 +1,9 @@
 """Authentication dependencies for extracting user context from Databricks Apps."""
 
+import asyncio
 import logging
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Optional
 
 from fastapi import Request
 
@@ -10,7 +12,19 @@ from server.services.user_service import UserService
 logger = logging.getLogger(__name__)
 
 
-async def get_current_user_context(request: Request) -> Dict[str, Optional[str]]:
+@dataclass(slots=True)
+class UserContext:
+  """User information for the current request."""
+
+  user_id: Optional[str] = None
+  email: Optional[str] = None
+  username: Optional[str] = None
+  real_ip: Optional[str] = None
+  request_id: Optional[str] = None
+  display_name: Optional[str] = None
+
+
+async def get_current_user_context(request: Request) -> UserContext:
   """Extract user context from Databricks Apps authentication headers.
   If headers are not available, fallback to workspace client.
 
@@ -18,70 +32,58 @@ async def get_current_user_context(request: Request) -> Dict[str, Optional[str]]
   when on-behalf-of-user authentication is enabled.
 
   Returns:
-      Dict containing user information from headers or workspace client
+      UserContext with user information from headers or workspace client
   """
   headers = request.headers
 
   # Try to get user info from headers first
-  user_context = {
-    'user_id': headers.get('X-Forwarded-User'),
-    'email': headers.get('X-Forwarded-Email'),
-    'username': headers.get('X-Forwarded-Preferred-Username'),
-    'real_ip': headers.get('X-Real-Ip'),
-    'request_id': headers.get('X-Request-Id'),
-  }
-
-  # Check if we have any user information from headers
-  has_user_info = any([user_context['user_id'], user_context['email'], user_context['username']])
+  user_context = UserContext(
+    user_id=headers.get('X-Forwarded-User'),
+    email=headers.get('X-Forwarded-Email'),
+    username=headers.get('X-Forwarded-Preferred-Username'),
+    real_ip=headers.get('X-Real-Ip'),
+    request_id=getattr(request.state, 'request_id', None),
+  )
 
   # If no user info from headers, fallback to user service
-  if not has_user_info:
+  if not (user_context.user_id or user_context.email or user_context.username):
     try:
-      user_service = UserService()
-      current_user = user_service.get_current_user()
+      # Building the workspace client and calling it both block; keep them off the event loop
+      current_user = await asyncio.to_thread(lambda: UserService().get_current_user())
 
-      user_context.update(
-        {
-          'user_id': str(current_user.id) if current_user.id else None,
-          'email': current_user.emails[0].value if current_user.emails else None,
-          'username': current_user.user_name,
-          'display_name': current_user.display_name,
-        }
-      )
+      user_context.user_id = str(current_user.id) if current_user.id else None
+      user_context.email = current_user.emails[0].value if current_user.emails else None
+      user_context.username = current_user.user_name
+      user_context.display_name = current_user.display_name
 
-      logger.info(f'Fallback to user service for user: {user_context.get("email", "Unknown")}')
+      logger.info(f'Fallback to user service for user: {user_context.email or "Unknown"}')
 
     except Exception as e:
       logger.warning(f'Failed to get user from user service: {str(e)}')
       # Keep the original empty context, will fallback to 'System' in get_user_for_logging
 
   # Set display_name if we have email
-  if user_context.get('email') and not user_context.get('display_name'):
-    user_context['display_name'] = user_context['email'].split('@')[0]
+  if user_context.email and not user_context.display_name:
+    user_context.display_name = user_context.email.split('@')[0]
 
   return user_context
 
 
-def get_user_for_logging(user_context: Dict[str, Optional[str]]) -> str:
+def get_user_for_logging(user_context: UserContext) -> str:
   """Get a user identifier for logging purposes.
 
   Prioritizes email, then username, then user_id, falls back to 'System'.
   """
-  return (
-    user_context.get('email')
-    or user_context.get('username')
-    or user_context.get('user_id')
-    or 'System'
-  )
+  return user_context.email or user_context.username or user_context.user_id or 'System'
 
 
-def get_user_display_name(user_context: Dict[str, Optional[str]]) -> str:
+def get_user_display_name(user_context: UserContext) -> str:
   """Get a user display name for UI purposes.
 
   Extracts name from email or uses username.
   """
-  email = user_context.get('email')
+  email = user_context.email
   if email and '@' in email:
     return email.split('@')[0].replace('.', ' ').title()
 
-  return user_context.get('username') or user_context.get('display_name') or 'Unknown User'
+  return user_context.username or user_context.display_name or 'Unknown User'
@@ -0,0 +1,13 @@
+"""Database readiness dependency for routes that query PostgreSQL."""
+
+from fastapi import Request
+
+
+async def require_db(request: Request) -> None:
+  """Wait for background database initialization to finish before serving a request.
+
+  The lifespan handler starts pool creation and table migrations as a task so the
+  server can accept connections immediately. Re-raises the startup error if
+  initialization failed.
+  """
+  await request.app.state.db_ready
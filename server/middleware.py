@@ -0,0 +1,264 @@
+"""ASGI middleware for the Information Extraction App."""
+
+import asyncio
+import hashlib
+import logging
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# ============================================================================
+# REQUEST ID
+# ============================================================================
+
+# ID of the request being handled; copied into worker threads along with the context
+request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+
+class RequestIdFilter(logging.Filter):
+  """Stamp log records with the current request ID ('-' outside of a request)."""
+
+  def filter(self, record: logging.LogRecord) -> bool:
+    """Add ``request_id`` to the record; never drops it."""
+    record.request_id = request_id_var.get() or '-'
+    return True
+
+
+class RequestIdMiddleware:
+  """Give each HTTP request an ID for logs and echo it in the X-Request-Id header.
+
+  The ID forwarded by the Databricks Apps proxy is reused when present, otherwise one is
+  generated. It is exposed as ``request.state.request_id`` and through ``request_id_var``.
+  """
+
+  def __init__(self, app: ASGIApp) -> None:
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Handle one ASGI request with its ID set for the duration of the call."""
+    if scope['type'] != 'http':
+      await self.app(scope, receive, send)
+      return
+
+    request_id = Headers(scope=scope).get('x-request-id') or uuid.uuid4().hex
+    scope.setdefault('state', {})['request_id'] = request_id
+
+    async def send_wrapper(message: Message) -> None:
+      if message['type'] == 'http.response.start':
+        MutableHeaders(scope=message)['x-request-id'] = request_id
+      await send(message)
+
+    token = request_id_var.set(request_id)
+    try:
+      await self.app(scope, receive, send_wrapper)
+    finally:
+      request_id_var.reset(token)
+
+
+# ============================================================================
+# ETAG / CONDITIONAL GET
+# ============================================================================
+
+# Headers that are kept on a 304 response (RFC 9110 section 15.4.5)
+_NOT_MODIFIED_HEADERS = ('cache-control', 'content-location', 'etag', 'expires', 'vary')
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+  """Check an If-None-Match header against an ETag using weak comparison."""
+  candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+  return '*' in candidates or etag.removeprefix('W/') in candidates
+
+
+class ETagMiddleware:
+  """Add ETags to GET responses and answer matching If-None-Match requests with 304.
+
+  Responses that already carry an ETag (index.html, static files) are compared as-is.
+  Other successful responses up to ``max_body_size`` bytes are buffered and tagged
+  with a hash of their body. Streaming responses without a Content-Length pass through.
+  """
+
+  def __init__(self, app: ASGIApp, max_body_size: int = 1024 * 1024) -> None:
+    self.app = app
+    self.max_body_size = max_body_size
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Handle one ASGI request, tagging or short-circuiting GET responses."""
+    if scope['type'] != 'http' or scope['method'] != 'GET':
+      await self.app(scope, receive, send)
+      return
+
+    if_none_match = Headers(scope=scope).get('if-none-match')
+    mode = 'pending'  # pending -> buffer | passthrough | drop
+    start_message: Message = {}
+    body_chunks = []
+
+    async def send_not_modified(headers: Headers) -> None:
+      raw_headers = [
+        (key.encode('latin-1'), value.encode('latin-1'))
+        for key, value in headers.items()
+        if key in _NOT_MODIFIED_HEADERS
+      ]
+      await send({'type': 'http.response.start', 'status': 304, 'headers': raw_headers})
+      await send({'type': 'http.response.body', 'body': b''})
+
+    async def send_wrapper(message: Message) -> None:
+      nonlocal mode, start_message
+
+      if mode == 'passthrough':
+        await send(message)
+        return
+      if mode == 'drop':
+        return
+
+      if message['type'] == 'http.response.start':
+        headers = Headers(raw=message['headers'])
+        content_length = headers.get('content-length')
+        etag = headers.get('etag')
+
+        if message['status'] != 200:
+          mode = 'passthrough'
+        elif etag is not None:
+          if if_none_match is not None and _etag_matches(if_none_match, etag):
+            mode = 'drop'
+            await send_not_modified(headers)
+            return
+          mode = 'passthrough'
+        elif content_length is None or int(content_length) > self.max_body_size:
+          mode = 'passthrough'
+        else:
+          mode = 'buffer'
+          start_message = message
+          return
+
+        await send(message)
+        return
+
+      # mode == 'buffer': collect the body until the final chunk arrives
+      body_chunks.append(message.get('body', b''))
+      if message.get('more_body', False):
+        return
+
+      body = b''.join(body_chunks)
+      etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+      headers = MutableHeaders(raw=list(start_message['headers']))
+      headers['etag'] = etag
+      start_message['headers'] = headers.raw
+
+      if if_none_match is not None and _etag_matches(if_none_match, etag):
+        await send_not_modified(headers)
+        return
+
+      await send(start_message)
+      await send({'type': 'http.response.body', 'body': body})
+
+    await self.app(scope, receive, send_wrapper)
+
+
+# ============================================================================
+# REQUEST COALESCING
+# ============================================================================
+
+
+# Request headers that identify the caller (see get_current_user_context) or carry their
+# credentials; requests are only coalesced when all of them match
+_IDENTITY_HEADERS = (
+  'x-forwarded-user',
+  'x-forwarded-email',
+  'x-forwarded-preferred-username',
+  'x-forwarded-access-token',
+  'authorization',
+)
+
+
+def _copy_message(message: Message) -> Message:
+  """Copy an ASGI response message so that changes to the copy don't reach the original.
+
+  Header pairs and bodies are immutable bytes; only the dict and header list are copied.
+  """
+  copied = dict(message)
+  if 'headers' in copied:
+    copied['headers'] = list(copied['headers'])
+  return copied
+
+
+class RequestCoalescingMiddleware:
+  """Serve concurrent identical API GETs from a single execution of the route.
+
+  The first request for a given path, query string and user runs normally while its
+  response messages are recorded; identical requests arriving before it finishes
+  wait and replay that response instead of running the same queries again. If the
+  first request fails, or streams a response without a Content-Length (which is not
+  buffered), the waiters run their own request.
+
+  Messages are recorded as snapshots taken before outer middleware (GZip, CORS, ...)
+  sees them, and every replay sends fresh copies, so each waiter's own middleware
+  stack rewrites its response independently.
+  """
+
+  def __init__(
+    self, app: ASGIApp, path_prefix: str = '/api/', exclude_paths: Iterable[str] = ()
+  ) -> None:
+    self.app = app
+    self.path_prefix = path_prefix
+    self.exclude_paths = frozenset(exclude_paths)
+    self._inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Handle one ASGI request, sharing the response of identical in-flight API GETs."""
+    if (
+      scope['type'] != 'http'
+      or scope['method'] != 'GET'
+      or not scope['path'].startswith(self.path_prefix)
+      or scope['path'] in self.exclude_paths
+    ):
+      await self.app(scope, receive, send)
+      return
+
+    headers = Headers(scope=scope)
+    # Every identity header is part of the key, so user-scoped responses are only shared
+    # by requests from the same caller. Headers that outer middleware negotiate on are
+    # too, so coalesced requests are ones that would get byte-identical responses.
+    key = (
+      scope['path'],
+      scope['query_string'],
+      *(headers.get(name) for name in _IDENTITY_HEADERS),
+      headers.get('accept-encoding'),
+      headers.get('origin'),
+    )
+
+    inflight = self._inflight.get(key)
+    if inflight is not None:
+      messages = await asyncio.shield(inflight)
+      if messages is not None:
+        for message in messages:
+          await send(_copy_message(message))
+        return
+      await self.app(scope, receive, send)
+      return
+
+    future = asyncio.get_running_loop().create_future()
+    self._inflight[key] = future
+    messages: Optional[List[Message]] = []
+
+    async def send_wrapper(message: Message) -> None:
+      nonlocal messages
+      # Streaming responses aren't buffered for replay; waiters run their own request
+      if message['type'] == 'http.response.start':
+        if 'content-length' not in Headers(raw=message['headers']):
+          messages = None
+      if messages is not None:
+        messages.append(_copy_message(message))
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_wrapper)
+    except BaseException:
+      future.set_result(None)
+      raise
+    else:
+      future.set_result(messages)
+    finally:
+      del self._inflight[key]
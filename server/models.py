@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # ============================================================================
 # SCHEMA FIELD MODELS
@@ -29,7 +29,7 @@ class ExtractionSchemaCreate(BaseModel):
 
   name: str = Field(..., min_length=1, max_length=255)
   description: str = Field(default='', max_length=1000)
-  fields: List[SchemaField] = Field(..., min_items=1, max_items=50)
+  fields: List[SchemaField] = Field(..., min_length=1, max_length=50)
 
 
 class ExtractionSchemaUpdate(BaseModel):
@@ -37,7 +37,7 @@ class ExtractionSchemaUpdate(BaseModel):
 
   name: Optional[str] = Field(None, min_length=1, max_length=255)
   description: Optional[str] = Field(None, max_length=1000)
-  fields: Optional[List[SchemaField]] = Field(None, min_items=1, max_items=50)
+  fields: Optional[List[SchemaField]] = Field(None, min_length=1, max_length=50)
   is_active: Optional[bool] = None
 
 
@@ -51,8 +51,7 @@ class ExtractionSchema(BaseModel):
   is_active: bool
   created_at: datetime
 
-  class Config:
-    from_attributes = True
+  model_config = ConfigDict(from_attributes=True)
 
 
 class ExtractionSchemaSummary(BaseModel):
@@ -65,8 +64,7 @@ class ExtractionSchemaSummary(BaseModel):
   is_active: bool
   created_at: datetime
 
-  class Config:
-    from_attributes = True
+  model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -105,8 +103,7 @@ class ExtractionJob(BaseModel):
   error_message: Optional[str] = None
   databricks_run_id: Optional[int] = None
 
-  class Config:
-    from_attributes = True
+  model_config = ConfigDict(from_attributes=True)
 
 
 class ExtractionJobSummary(BaseModel):
@@ -120,8 +117,7 @@ class ExtractionJobSummary(BaseModel):
   created_at: datetime
   completed_at: Optional[datetime] = None
 
-  class Config:
-    from_attributes = True
+  model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -139,8 +135,7 @@ class Document(BaseModel):
   file_size: int
   upload_time: datetime
 
-  class Config:
-    from_attributes = True
+  model_config = ConfigDict(from_attributes=True)
 
 
 class DocumentSummary(BaseModel):
@@ -151,8 +146,7 @@ class DocumentSummary(BaseModel):
   file_size: int
   upload_time: datetime
 
-  class Config:
-    from_attributes = True
+  model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -163,7 +157,6 @@ class DocumentSummary(BaseModel):
 class ExtractionResult(BaseModel):
   """Extraction result record."""
 
-  id: int
   job_id: int
   document_id: int
   schema_id: int
@@ -172,8 +165,7 @@ class ExtractionResult(BaseModel):
   file_content_checksum: Optional[str] = None
   created_at: datetime
 
-  class Config:
-    from_attributes = True
+  model_config = ConfigDict(from_attributes=True)
 
 
 class ExtractionResultSummary(BaseModel):
@@ -184,8 +176,7 @@ class ExtractionResultSummary(BaseModel):
   confidence_scores: Optional[Dict[str, float]] = None
   file_content_checksum: Optional[str] = None
 
-  class Config:
-    from_attributes = True
+  model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -279,11 +270,10 @@ class DBDocument(BaseModel):
 class DBExtractionResult(BaseModel):
   """Database model for extraction_results table."""
 
-  id: Optional[int] = None
   job_id: int
   document_id: int
   schema_id: int
   extracted_data: str  # JSON string
-  confidence_scores: Optional[str] = None  # JSON string
+  confidence_scores: Optional[str] = None  # JSON string, stored as JSONB
   file_content_checksum: Optional[str] = None
   created_at: Optional[datetime] = None
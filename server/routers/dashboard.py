@@ -1,89 +1,98 @@
 """API routes for dashboard statistics and data."""
 
 import logging
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException
 
-from server.database import get_db_connection, return_db_connection
+from server.database import db_cursor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-@router.get('/dashboard/stats')
-async def get_dashboard_stats() -> Dict[str, Any]:
-  """Get dashboard statistics."""
-  try:
-    conn = get_db_connection()
+# The materialized view is refreshed on read once it is older than this
+DASHBOARD_STATS_MAX_AGE_SECONDS = 60
+# The last response is served from memory for this long, skipping the database entirely
+DASHBOARD_STATS_CACHE_SECONDS = 30
+_stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
 
-    with conn.cursor() as cursor:
-      # Get job statistics
-      cursor.execute("""
-                SELECT
-                    COUNT(*) as total_jobs,
-                    COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending_jobs,
-                    COUNT(CASE WHEN status = 'processing' THEN 1 END) as processing_jobs,
-                    COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_jobs,
-                    COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed_jobs
-                FROM information_extraction.extraction_jobs
-                WHERE created_at >= NOW() - INTERVAL '30 days'
-            """)
-      job_stats = cursor.fetchone()
+DASHBOARD_STATS_QUERY = """
+    SELECT
+        refreshed_at,
+        total_jobs,
+        pending_jobs,
+        processing_jobs,
+        completed_jobs,
+        failed_jobs,
+        total_schemas,
+        active_schemas,
+        total_documents,
+        total_file_size,
+        total_results
+    FROM information_extraction.mv_dashboard_stats
+"""
 
-      # Get schema statistics
-      cursor.execute("""
-                SELECT
-                    COUNT(*) as total_schemas,
-                    COUNT(CASE WHEN is_active = true THEN 1 END) as active_schemas
-                FROM information_extraction.extraction_schemas
-            """)
-      schema_stats = cursor.fetchone()
 
-      # Get document statistics
-      cursor.execute("""
-                SELECT
-                    COUNT(*) as total_documents,
-                    COALESCE(SUM(file_size), 0) as total_file_size
-                FROM information_extraction.documents d
-                JOIN information_extraction.extraction_jobs j ON d.job_id = j.id
-                WHERE j.created_at >= NOW() - INTERVAL '30 days'
-            """)
-      doc_stats = cursor.fetchone()
+@router.get('/dashboard/stats')
+def get_dashboard_stats() -> Dict[str, Any]:
+  """Get dashboard statistics."""
+  global _stats_cache
+  now = time.monotonic()
+  cached = _stats_cache
+  if cached is not None and now - cached[0] < DASHBOARD_STATS_CACHE_SECONDS:
+    return cached[1]
+
+  try:
+    with db_cursor() as cursor:
+      cursor.execute(
+        DASHBOARD_STATS_QUERY + ' WHERE refreshed_at >= NOW() - make_interval(secs => %s)',
+        (DASHBOARD_STATS_MAX_AGE_SECONDS,),
+      )
+      row = cursor.fetchone()
+      if row is None:
+        cursor.execute(
+          'REFRESH MATERIALIZED VIEW CONCURRENTLY information_extraction.mv_dashboard_stats'
+        )
+        cursor.execute(DASHBOARD_STATS_QUERY)
+        row = cursor.fetchone()
 
-      # Get extraction results count
-      cursor.execute("""
-                SELECT COUNT(*) as total_results
-                FROM information_extraction.extraction_results r
-                JOIN information_extraction.extraction_jobs j ON r.job_id = j.id
-                WHERE j.created_at >= NOW() - INTERVAL '30 days'
-            """)
-      result_stats = cursor.fetchone()
+    (
+      refreshed_at,
+      total_jobs,
+      pending_jobs,
+      processing_jobs,
+      completed_jobs,
+      failed_jobs,
+      total_schemas,
+      active_schemas,
+      total_documents,
+      total_file_size,
+      total_results,
+    ) = row
 
-      # Calculate success rate
-      total_jobs = job_stats[0] if job_stats[0] > 0 else 1
-      completed_jobs = job_stats[3]
-      success_rate = round((completed_jobs / total_jobs) * 100, 1)
+    # Calculate success rate
+    success_rate = round((completed_jobs / max(total_jobs, 1)) * 100, 1)
 
-      return {
-        'total_jobs': job_stats[0],
-        'pending_jobs': job_stats[1],
-        'processing_jobs': job_stats[2],
-        'completed_jobs': job_stats[3],
-        'failed_jobs': job_stats[4],
-        'total_schemas': schema_stats[0],
-        'active_schemas': schema_stats[1],
-        'total_documents': doc_stats[0],
-        'total_file_size': doc_stats[1],
-        'total_results': result_stats[0],
-        'success_rate': success_rate,
-        'last_updated': 'now',
-      }
+    stats = {
+      'total_jobs': total_jobs,
+      'pending_jobs': pending_jobs,
+      'processing_jobs': processing_jobs,
+      'completed_jobs': completed_jobs,
+      'failed_jobs': failed_jobs,
+      'total_schemas': total_schemas,
+      'active_schemas': active_schemas,
+      'total_documents': total_documents,
+      'total_file_size': total_file_size,
+      'total_results': total_results,
+      'success_rate': success_rate,
+      'last_updated': refreshed_at.isoformat(),
+    }
+    _stats_cache = (now, stats)
+    return stats
 
   except Exception as e:
     logger.error(f'Error fetching dashboard stats: {str(e)}')
     raise HTTPException(status_code=500, detail=f'Failed to fetch dashboard stats: {str(e)}')
-  finally:
-    if 'conn' in locals():
-      return_db_connection(conn)
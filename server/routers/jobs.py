@@ -1,28 +1,39 @@
 """API routes for extraction job management."""
 
+import asyncio
 import logging
 import os
 import traceback
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import BinaryIO, List, Optional
 
-from databricks.sdk import WorkspaceClient
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from server.config import get_config
 from server.database import (
-  create_document,
+  ANALYZE_MIN_ROWS,
+  SUBMISSION_RESUME_LOCK_ID,
+  UPLOADABLE_JOB_STATUSES,
+  analyze_table,
+  claim_extraction_job_submission,
+  create_documents_bulk,
   create_extraction_job,
   create_upload_log,
+  end_extraction_job_submission,
   get_all_extraction_jobs,
   get_documents_by_job,
   get_extraction_job,
   get_extraction_job_with_schema,
   get_extraction_schema,
   get_results_by_job,
-  update_extraction_job,
+  get_submitting_extraction_jobs,
+  iter_results_by_job,
+  set_extraction_job_status,
+  try_advisory_xact_lock,
 )
-from server.dependencies.auth import get_current_user_context, get_user_for_logging
+from server.dependencies.auth import UserContext, get_current_user_context, get_user_for_logging
 from server.models import (
   DBDocument,
   DBExtractionJob,
@@ -31,7 +42,7 @@ from server.models import (
   JobResultsResponse,
   JobStatusResponse,
 )
-from server.services.databricks_service import DatabricksService
+from server.services.databricks_service import DatabricksService, get_workspace_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -42,22 +53,95 @@ UPLOAD_BASE_PATH = _config.upload.base_path  # No fallback - will fail if not co
 ALLOWED_EXTENSIONS = set(_config.upload.allowed_extensions)
 MAX_FILE_SIZE = _config.upload.max_size_mb * 1024 * 1024
 
+# Files uploaded to UC Volumes at the same time by one request
+UPLOAD_CONCURRENCY = 8
 
-def get_workspace_client() -> WorkspaceClient:
-  """Get Databricks workspace client."""
-  return WorkspaceClient()
+# Attempts at starting the Databricks run after an upload, with exponential backoff
+TRIGGER_MAX_ATTEMPTS = 5
+TRIGGER_RETRY_BASE_SECONDS = 1.0
 
 
-def upload_to_uc_volumes(file_content: bytes, file_path: str) -> None:
-  """Upload file content to UC Volumes using Databricks workspace API."""
+def upload_to_uc_volumes(contents: BinaryIO, file_path: str) -> None:
+  """Upload a file object to UC Volumes using Databricks workspace API.
+
+  The SDK reads ``contents`` as it sends, so the file is never held in memory whole.
+  """
   client = get_workspace_client()
 
   # Upload to UC Volumes using workspace files API
-  client.files.upload(file_path=str(file_path), contents=file_content, overwrite=True)
+  client.files.upload(file_path=str(file_path), contents=contents, overwrite=True)
+
+
+async def trigger_processing(job_id: int, schema_id: int, upload_attempt: int) -> None:
+  """Start the Databricks run for a 'submitting' job and record the outcome on the job.
+
+  Runs after the upload response has been sent. The idempotency token is derived from the
+  job's upload attempt, so retries here, or a resubmission after a restart, can't start a
+  second run for the same upload. Clients follow progress through ``/jobs/{job_id}/status``.
+  """
+  idempotency_token = f'ie-job-{job_id}-{upload_attempt}'
+  for attempt in range(1, TRIGGER_MAX_ATTEMPTS + 1):
+    try:
+      run_id = await DatabricksService.trigger_extraction_job(job_id, schema_id, idempotency_token)
+    except Exception as e:
+      if attempt < TRIGGER_MAX_ATTEMPTS:
+        delay = TRIGGER_RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+        logger.warning(
+          f'Triggering processing for job {job_id} failed (attempt {attempt}), '
+          f'retrying in {delay:.0f}s: {str(e)}'
+        )
+        await asyncio.sleep(delay)
+        continue
+
+      logger.error(f'❌ Failed to trigger processing for job {job_id}: {str(e)}')
+      await asyncio.to_thread(
+        end_extraction_job_submission,
+        job_id,
+        upload_attempt,
+        'failed',
+        error_message=f'Failed to trigger processing: {str(e)}',
+      )
+      return
+
+    # Record the run, unless a later upload has claimed the job since
+    await asyncio.to_thread(
+      end_extraction_job_submission, job_id, upload_attempt, 'processing', run_id
+    )
+    return
+
+
+async def resume_pending_submissions() -> None:
+  """Trigger the runs of jobs left in 'submitting' when the process last stopped.
+
+  Each run is triggered with the token of its original attempt, so a run that did start
+  before the restart is returned rather than started again. The pass holds an advisory
+  lock, so when several processes start together only one of them resumes the jobs.
+  """
+  with try_advisory_xact_lock(SUBMISSION_RESUME_LOCK_ID) as locked:
+    if not locked:
+      logger.info('Submitting jobs are being resumed by another process')
+      return
+
+    jobs = await asyncio.to_thread(get_submitting_extraction_jobs)
+    if jobs:
+      logger.info(f'Resuming processing trigger for {len(jobs)} submitting job(s)')
+    await asyncio.gather(
+      *(trigger_processing(job['id'], job['schema_id'], job['upload_attempts']) for job in jobs)
+    )
+
+
+def _upload_size(file: UploadFile) -> int:
+  """Size in bytes of an uploaded file, without reading its body."""
+  if file.size is not None:
+    return file.size
+  file.file.seek(0, os.SEEK_END)
+  size = file.file.tell()
+  file.file.seek(0)
+  return size
 
 
 @router.get('/jobs', response_model=List[dict])
-async def get_jobs():
+def get_jobs():
   """Get all extraction jobs with summary information."""
   try:
     return get_all_extraction_jobs()
@@ -67,10 +151,10 @@ async def get_jobs():
     raise HTTPException(status_code=500, detail=f'Failed to fetch jobs: {str(e)}')
 
 
-@router.post('/jobs', response_model=dict)
-async def create_job(
+@router.post('/jobs')
+def create_job(
   job: ExtractionJobCreate,
-  user_context: Dict[str, Optional[str]] = Depends(get_current_user_context),
+  user_context: UserContext = Depends(get_current_user_context),
 ):
   """Create a new extraction job."""
   try:
@@ -87,11 +171,13 @@ async def create_job(
     user_id = get_user_for_logging(user_context)
     job_id = create_extraction_job(db_job, created_by=user_id)
 
-    return {
-      'success': True,
-      'message': 'Job created successfully',
-      'job_id': job_id,
-    }
+    return ORJSONResponse(
+      {
+        'success': True,
+        'message': 'Job created successfully',
+        'job_id': job_id,
+      }
+    )
   except HTTPException:
     raise
   except Exception as e:
@@ -100,16 +186,18 @@ async def create_job(
     raise HTTPException(status_code=500, detail=f'Failed to create job: {str(e)}')
 
 
-@router.get('/jobs/{job_id}', response_model=dict)
+@router.get('/jobs/{job_id}')
 async def get_job(job_id: int):
   """Get job details with documents and results."""
   try:
-    job_with_schema = get_extraction_job_with_schema(job_id)
+    job_with_schema = await asyncio.to_thread(get_extraction_job_with_schema, job_id)
     if not job_with_schema:
       raise HTTPException(status_code=404, detail='Job not found')
 
-    documents = get_documents_by_job(job_id)
-    results = get_results_by_job(job_id)
+    documents, results = await asyncio.gather(
+      asyncio.to_thread(get_documents_by_job, job_id),
+      asyncio.to_thread(get_results_by_job, job_id),
+    )
 
     # Add databricks_job_id to job data if available
     job_dict = (
@@ -131,7 +219,7 @@ async def get_job(job_id: int):
     # Add schema field count
     schema_id = job_dict.get('schema_id')
     if schema_id:
-      schema = get_extraction_schema(schema_id)
+      schema = await asyncio.to_thread(get_extraction_schema, schema_id)
       job_dict['schema_field_count'] = len(schema.fields) if schema and schema.fields else 0
     else:
       job_dict['schema_field_count'] = 0
@@ -164,17 +252,18 @@ async def get_job(job_id: int):
 @router.post('/jobs/{job_id}/upload', response_model=FileUploadResponse)
 async def upload_files(
   job_id: int,
+  background_tasks: BackgroundTasks,
   files: List[UploadFile] = File(...),
-  user_context: Dict[str, Optional[str]] = Depends(get_current_user_context),
+  user_context: UserContext = Depends(get_current_user_context),
 ):
   """Upload documents to a job and trigger processing."""
   try:
     # Check if job exists
-    job = get_extraction_job(job_id)
+    job = await asyncio.to_thread(get_extraction_job, job_id)
     if not job:
       raise HTTPException(status_code=404, detail='Job not found')
 
-    if job.status not in ['not_submitted', 'uploaded', 'failed']:
+    if job.status not in UPLOADABLE_JOB_STATUSES:
       raise HTTPException(
         status_code=400,
         detail=f'Cannot upload files to job with status: {job.status}',
@@ -184,12 +273,11 @@ async def upload_files(
     if not files:
       raise HTTPException(status_code=400, detail='No files provided')
 
-    uploaded_files = []
-    total_size = 0
-
     # Prepare UC Volumes path for this job
     job_upload_path = f'{UPLOAD_BASE_PATH.rstrip("/")}/job_{job_id}'
 
+    # Validate every file before uploading any of them
+    documents = []
     for file in files:
       # Validate file extension
       file_ext = Path(file.filename).suffix.lower()
@@ -199,9 +287,9 @@ async def upload_files(
           detail=(f'File type {file_ext} not supported. Allowed: {", ".join(ALLOWED_EXTENSIONS)}'),
         )
 
-      # Read and validate file size
-      content = await file.read()
-      if len(content) > MAX_FILE_SIZE:
+      # Validate file size; the body stays in Starlette's spooled temp file
+      file_size = _upload_size(file)
+      if file_size > MAX_FILE_SIZE:
         raise HTTPException(
           status_code=400,
           detail=(
@@ -209,64 +297,76 @@ async def upload_files(
           ),
         )
 
-      # Upload to UC Volumes
-      uc_file_path = f'{job_upload_path}/{file.filename}'
-      try:
-        upload_to_uc_volumes(content, uc_file_path)
-      except Exception as e:
-        raise HTTPException(
-          status_code=500,
-          detail=f'Failed to upload {file.filename} to UC Volumes: {str(e)}',
+      documents.append(
+        DBDocument(
+          job_id=job_id,
+          filename=file.filename,
+          file_path=f'{job_upload_path}/{file.filename}',
+          file_size=file_size,
         )
-
-      # Create document record
-      document = DBDocument(
-        job_id=job_id,
-        filename=file.filename,
-        file_path=uc_file_path,
-        file_size=len(content),
       )
-      create_document(document)
-
-      uploaded_files.append(file.filename)
-      total_size += len(content)
-
-    # Update job status and upload directory
-    update_extraction_job(job_id, {'status': 'uploaded', 'upload_directory': job_upload_path})
 
-    # Create upload log entry (required by notebook)
-    user_id = get_user_for_logging(user_context)
-    user_email = user_context.get('email', '')
-    create_upload_log(
-      job_id,
-      job_upload_path,
-      'upload',
-      'Files uploaded to UC Volumes',
-      '',  # details
-      user_id,
-      user_email,
+    # Claim the job before touching its files, so a concurrent upload to the same job is
+    # turned away instead of overwriting them; it stays claimed until the run is triggered
+    upload_attempt = await asyncio.to_thread(
+      claim_extraction_job_submission, job_id, job_upload_path
     )
+    if upload_attempt is None:
+      raise HTTPException(status_code=409, detail='Job is already being submitted for processing')
 
-    # Trigger Databricks processing
     try:
-      run_id = await DatabricksService.trigger_extraction_job(job_id, job.schema_id)
+      # Upload to UC Volumes, several files at a time
+      upload_slots = asyncio.Semaphore(UPLOAD_CONCURRENCY)
 
-      # Update job with Databricks run ID and processing status
-      update_extraction_job(job_id, {'status': 'processing', 'databricks_run_id': run_id})
+      async def upload(file: UploadFile, document: DBDocument) -> None:
+        async with upload_slots:
+          await asyncio.to_thread(upload_to_uc_volumes, file.file, document.file_path)
 
-    except Exception as e:
-      # Update job status to indicate processing trigger failed
-      update_extraction_job(
-        job_id, {'status': 'failed', 'error_message': f'Failed to trigger processing: {str(e)}'}
+      outcomes = await asyncio.gather(
+        *(upload(file, document) for file, document in zip(files, documents)),
+        return_exceptions=True,
       )
-      raise HTTPException(
-        status_code=500,
-        detail=f'Files uploaded but failed to trigger processing: {str(e)}',
+      for document, outcome in zip(documents, outcomes):
+        if isinstance(outcome, BaseException):
+          raise HTTPException(
+            status_code=500,
+            detail=f'Failed to upload {document.filename} to UC Volumes: {str(outcome)}',
+          )
+
+      # Create document records in one batch
+      await asyncio.to_thread(create_documents_bulk, documents)
+
+      # Create upload log entry (required by notebook)
+      user_id = get_user_for_logging(user_context)
+      user_email = user_context.email or ''
+      await asyncio.to_thread(
+        create_upload_log,
+        job_id,
+        job_upload_path,
+        'upload',
+        'Files uploaded to UC Volumes',
+        '',  # details
+        user_id,
+        user_email,
       )
+    except Exception:
+      # Give the job back in the status it had, so the upload can be retried
+      await asyncio.to_thread(end_extraction_job_submission, job_id, upload_attempt, job.status)
+      raise
+
+    uploaded_files = [document.filename for document in documents]
+
+    # Large uploads shift documents' statistics enough to matter to the planner
+    if len(uploaded_files) >= ANALYZE_MIN_ROWS:
+      background_tasks.add_task(analyze_table, 'information_extraction.documents')
+
+    # Trigger Databricks processing once the response is sent; the job stays 'submitting'
+    # until the run starts
+    background_tasks.add_task(trigger_processing, job_id, job.schema_id, upload_attempt)
 
     return FileUploadResponse(
       success=True,
-      message=f'Successfully uploaded {len(uploaded_files)} files and triggered processing',
+      message=f'Successfully uploaded {len(uploaded_files)} files; processing is being triggered',
       job_id=job_id,
       uploaded_files=uploaded_files,
       file_count=len(uploaded_files),
@@ -282,7 +382,7 @@ async def upload_files(
 async def get_job_status(job_id: int):
   """Get job processing status."""
   try:
-    job = get_extraction_job(job_id)
+    job = await asyncio.to_thread(get_extraction_job, job_id)
     if not job:
       raise HTTPException(status_code=404, detail='Job not found')
 
@@ -291,7 +391,8 @@ async def get_job_status(job_id: int):
     progress_percent = None
     databricks_job_id = None
 
-    if job.databricks_run_id:
+    # A job being submitted has no run yet; any earlier run belongs to a previous upload
+    if job.databricks_run_id and job.status != 'submitting':
       try:
         databricks_status = await DatabricksService.get_job_status(job.databricks_run_id)
         current_stage = databricks_status.get('state', {}).get('life_cycle_state', 'unknown')
@@ -308,7 +409,7 @@ async def get_job_status(job_id: int):
             progress_percent = 100
             # Update local job status if not already completed
             if job.status != 'completed':
-              update_extraction_job(job_id, {'status': 'completed'})
+              await asyncio.to_thread(set_extraction_job_status, job_id, 'completed')
           else:
             progress_percent = 0
             # Update local job status if not already failed
@@ -316,7 +417,7 @@ async def get_job_status(job_id: int):
               error_msg = databricks_status.get('state', {}).get(
                 'state_message', 'Processing failed'
               )
-              update_extraction_job(job_id, {'status': 'failed', 'error_message': error_msg})
+              await asyncio.to_thread(set_extraction_job_status, job_id, 'failed', error_msg)
 
       except Exception as e:
         logger.error(
@@ -341,8 +442,12 @@ async def get_job_status(job_id: int):
 
 
 @router.get('/jobs/{job_id}/results', response_model=JobResultsResponse)
-async def get_job_results(job_id: int):
-  """Get extraction results for a job."""
+def get_job_results(
+  job_id: int,
+  limit: Optional[int] = Query(default=None, ge=1),
+  offset: int = Query(default=0, ge=0),
+):
+  """Get extraction results for a job, optionally one page at a time."""
   try:
     job = get_extraction_job(job_id)
     if not job:
@@ -351,7 +456,7 @@ async def get_job_results(job_id: int):
     schema = get_extraction_schema(job.schema_id)
     schema_name = schema.name if schema else 'Unknown Schema'
 
-    results = get_results_by_job(job_id)
+    results = get_results_by_job(job_id, limit=limit, offset=offset)
 
     # Normalize results to ensure extracted_data is a dictionary
     normalized_results = []
@@ -388,3 +493,21 @@ async def get_job_results(job_id: int):
     raise
   except Exception as e:
     raise HTTPException(status_code=500, detail=f'Failed to get job results: {str(e)}')
+
+
+@router.get('/jobs/{job_id}/results/stream')
+def stream_job_results(job_id: int):
+  """Stream extraction results for a job as newline-delimited JSON, one result per line.
+
+  Unlike /jobs/{job_id}/results, rows are sent as they are fetched instead of being
+  collected into a single response, so large jobs don't need to fit in memory.
+  """
+  job = get_extraction_job(job_id)
+  if not job:
+    raise HTTPException(status_code=404, detail='Job not found')
+
+  def ndjson_lines():
+    for result in iter_results_by_job(job_id):
+      yield orjson.dumps(result) + b'\n'
+
+  return StreamingResponse(ndjson_lines(), media_type='application/x-ndjson')
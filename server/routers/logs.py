@@ -1,31 +1,86 @@
 """API routes for system logs and activity tracking."""
 
 import logging
-from typing import Any, Dict, Optional
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from server.database import get_db_connection, return_db_connection
-from server.dependencies.auth import get_current_user_context, get_user_for_logging
+from server.database import db_cursor
+from server.dependencies.auth import UserContext, get_current_user_context, get_user_for_logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# One view per kind of activity; information_extraction.v_activity is their union
+ACTIVITY_VIEWS = (
+  'v_activity_uploads',
+  'v_activity_job_creations',
+  'v_activity_job_updates',
+  'v_activity_schemas',
+)
+
+
+def _describe_activity(
+  activity_type: str,
+  user_name: str,
+  subject: Optional[str],
+  status: Optional[str],
+  schema_name: Optional[str],
+  documents_count: Optional[int],
+  raw_message: Optional[str],
+  raw_details: Optional[str],
+) -> Tuple[Optional[str], Optional[str]]:
+  """Build the message and details of a v_activity row from its raw columns.
+
+  Matches the message/details columns of the view, which are only used for filtering.
+  """
+  if activity_type == 'Export':
+    directory_name = (subject or '').rsplit('/', 1)[-1]
+    return f'{user_name} exported results to {directory_name}', raw_details
+  if activity_type == 'Upload':
+    return f'{user_name} uploaded files for processing', raw_details
+  if activity_type == 'Job Creation':
+    return f'{user_name} created job "{subject or ""}"', f'Schema: {schema_name or ""}'
+  if activity_type in ('Job Completion', 'Job Failure', 'Job Update'):
+    return (
+      f'Job "{subject or ""}" {status or ""} (triggered by {user_name})',
+      f'{documents_count} documents processed',
+    )
+  if activity_type == 'Schema Creation':
+    return f'{user_name} created schema "{subject or ""}"', raw_details
+  return raw_message, raw_details
+
 
 @router.get('/logs')
-async def get_logs(
+def get_logs(
   limit: int = Query(default=200, ge=1, le=1000),
   offset: int = Query(default=0, ge=0),
   activity_type: Optional[str] = Query(default=None),
   user: Optional[str] = Query(default=None),
   search: Optional[str] = Query(default=None),
+  before: Optional[str] = Query(default=None),
+  include_total: bool = Query(default=False),
 ) -> Dict[str, Any]:
-  """Get user activity logs for business auditing."""
-  try:
-    conn = get_db_connection()
+  """Get user activity logs for business auditing.
+
+  Pages can be fetched with ``offset`` or, more cheaply for deep pages, by passing the
+  previous response's ``next_before`` cursor as ``before``. ``has_more`` tells whether
+  another page exists; the matching row count is only computed (as ``total``) when
+  ``include_total`` is set, since it has to read every activity.
+  """
+  keyset: Optional[Tuple[datetime, str]] = None
+  if before is not None:
+    try:
+      before_timestamp, before_id = before.split('|', 1)
+      keyset = (datetime.fromisoformat(before_timestamp), before_id)
+    except ValueError:
+      raise HTTPException(status_code=400, detail='Invalid before cursor')
 
-    with conn.cursor() as cursor:
+  try:
+    with db_cursor() as cursor:
       # Build the WHERE clause based on filters
       where_conditions = []
       params = []
@@ -45,158 +100,45 @@ async def get_logs(
       where_clause = 'WHERE ' + ' AND '.join(where_conditions) if where_conditions else ''
 
       # Get total count
-      count_query = f"""
-                SELECT COUNT(*)
-                FROM (
-                    -- File uploads and exports
-                    SELECT
-                        id,
-                        created_at as timestamp,
-                        CASE
-                            WHEN event_type = 'export' THEN 'Export'
-                            WHEN event_type = 'upload' THEN 'Upload'
-                            ELSE 'System'
-                        END as activity_type,
-                        message,
-                        details
-                    FROM information_extraction.upload_logs
-
-                    UNION ALL
-
-                    -- Job activities (creation and completion)
-                    SELECT
-                        j.id,
-                        j.created_at as timestamp,
-                        'Job Creation' as activity_type,
-                        CONCAT(COALESCE(j.created_by, 'System'), ' created job "', j.name, '"') as message,
-                        CONCAT('Schema: ', s.name) as details
-                    FROM information_extraction.extraction_jobs j
-                    LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id
-
-                    UNION ALL
-
-                    -- Job completions/failures
-                    SELECT
-                        j.id + 10000,
-                        COALESCE(j.completed_at, j.updated_at) as timestamp,
-                        CASE
-                            WHEN j.status = 'completed' THEN 'Job Completion'
-                            WHEN j.status = 'failed' THEN 'Job Failure'
-                            ELSE 'Job Update'
-                        END as activity_type,
-                        CONCAT('Job "', j.name, '" ', j.status, ' (triggered by ', COALESCE(j.created_by, 'System'), ')') as message,
-                        CONCAT(COALESCE(doc_count.count, 0), ' documents processed') as details
-                    FROM information_extraction.extraction_jobs j
-                    LEFT JOIN (
-                        SELECT job_id, COUNT(*) as count
-                        FROM information_extraction.documents
-                        GROUP BY job_id
-                    ) doc_count ON j.id = doc_count.job_id
-                    WHERE j.status IN ('completed', 'failed')
-
-                    UNION ALL
-
-                    -- Schema creation
-                    SELECT
-                        s.id + 20000,
-                        s.created_at as timestamp,
-                        'Schema Creation' as activity_type,
-                        CONCAT(COALESCE(s.created_by, 'System'), ' created schema "', s.name, '"') as message,
-                        s.description as details
-                    FROM information_extraction.extraction_schemas s
-                ) activities
-                {where_clause}
-            """
-
-      cursor.execute(count_query, params)
-      total_count = cursor.fetchone()[0]
-
-      # Get paginated results
-      data_query = f"""
-                SELECT
-                    id,
-                    timestamp,
-                    activity_type,
-                    message,
-                    details,
-                    user_name
-                FROM (
-                    -- File uploads and exports
-                    SELECT
-                        CONCAT('upload_', id) as id,
-                        created_at as timestamp,
-                        CASE
-                            WHEN event_type = 'export' THEN 'Export'
-                            WHEN event_type = 'upload' THEN 'Upload'
-                            ELSE 'System'
-                        END as activity_type,
-                        CASE
-                            WHEN event_type = 'export' THEN CONCAT(COALESCE(user_email, user_id, 'System'), ' exported results to ', SUBSTRING(upload_directory FROM '[^/]*$'))
-                            WHEN event_type = 'upload' THEN CONCAT(COALESCE(user_email, user_id, 'System'), ' uploaded files for processing')
-                            ELSE message
-                        END as message,
-                        details,
-                        COALESCE(user_email, user_id, 'System') as user_name
-                    FROM information_extraction.upload_logs
-
-                    UNION ALL
-
-                    -- Job creation
-                    SELECT
-                        CONCAT('job_create_', j.id) as id,
-                        j.created_at as timestamp,
-                        'Job Creation' as activity_type,
-                        CONCAT(COALESCE(j.created_by, 'System'), ' created job "', j.name, '"') as message,
-                        CONCAT('Schema: ', s.name) as details,
-                        COALESCE(j.created_by, 'System') as user_name
-                    FROM information_extraction.extraction_jobs j
-                    LEFT JOIN information_extraction.extraction_schemas s ON j.schema_id = s.id
-
-                    UNION ALL
-
-                    -- Job completions/failures
-                    SELECT
-                        CONCAT('job_status_', j.id) as id,
-                        COALESCE(j.completed_at, j.updated_at) as timestamp,
-                        CASE
-                            WHEN j.status = 'completed' THEN 'Job Completion'
-                            WHEN j.status = 'failed' THEN 'Job Failure'
-                            ELSE 'Job Update'
-                        END as activity_type,
-                        CONCAT('Job "', j.name, '" ', j.status, ' (triggered by ', COALESCE(j.created_by, 'System'), ')') as message,
-                        CONCAT(COALESCE(doc_count.count, 0), ' documents processed') as details,
-                        COALESCE(j.created_by, 'System') as user_name
-                    FROM information_extraction.extraction_jobs j
-                    LEFT JOIN (
-                        SELECT job_id, COUNT(*) as count
-                        FROM information_extraction.documents
-                        GROUP BY job_id
-                    ) doc_count ON j.id = doc_count.job_id
-                    WHERE j.status IN ('completed', 'failed')
+      total_count = None
+      if include_total:
+        cursor.execute(
+          f'SELECT COUNT(*) FROM information_extraction.v_activity {where_clause}', params
+        )
+        total_count = cursor.fetchone()[0]
 
-                    UNION ALL
+      # A keyset cursor replaces the offset: rows strictly after the previous page's last row
+      if keyset is not None:
+        where_conditions.append('(timestamp, id) < (%s, %s)')
+        params.extend(keyset)
+        offset = 0
+      where_clause = 'WHERE ' + ' AND '.join(where_conditions) if where_conditions else ''
 
-                    -- Schema creation
-                    SELECT
-                        CONCAT('schema_', s.id) as id,
-                        s.created_at as timestamp,
-                        'Schema Creation' as activity_type,
-                        CONCAT(COALESCE(s.created_by, 'System'), ' created schema "', s.name, '"') as message,
-                        s.description as details,
-                        COALESCE(s.created_by, 'System') as user_name
-                    FROM information_extraction.extraction_schemas s
-                ) activities
-                {where_clause}
-                ORDER BY timestamp DESC
+      # Get paginated results, plus one row to tell whether there is another page. ORDER
+      # BY ... LIMIT isn't pushed through UNION ALL, so each view is cut down to the rows
+      # that can reach this page (walking its timestamp index) before the pieces are merged
+      columns = """id, timestamp, activity_type, user_name, subject, status, schema_name,
+                       documents_count, raw_message, raw_details"""
+      order_by = 'ORDER BY timestamp DESC, id DESC'
+      branches = ' UNION ALL '.join(
+        f'(SELECT {columns} FROM information_extraction.{view} {where_clause} {order_by} LIMIT %s)'
+        for view in ACTIVITY_VIEWS
+      )
+      cursor.execute(
+        f"""
+                SELECT {columns}
+                FROM ({branches}) activities
+                {order_by}
                 LIMIT %s OFFSET %s
-            """
-
-      params.extend([limit, offset])
-      cursor.execute(data_query, params)
+            """,
+        [*params, limit + offset + 1] * len(ACTIVITY_VIEWS) + [limit + 1, offset],
+      )
 
+      # Rows are read straight off the cursor rather than copied into an intermediate list
+      has_more = cursor.rowcount > limit
       activities = []
-      for row in cursor.fetchall():
-        activity_id, timestamp, activity_type, message, details, user_name = row
+      for activity_id, timestamp, activity_type, user_name, *raw in islice(cursor, limit):
+        message, details = _describe_activity(activity_type, user_name, *raw)
         activities.append(
           {
             'id': str(activity_id),
@@ -208,30 +150,37 @@ async def get_logs(
           }
         )
 
-      return {'logs': activities, 'total': total_count, 'limit': limit, 'offset': offset}
+      # Cursor for the next page
+      next_before = None
+      if has_more and activities[-1]['timestamp'] is not None:
+        next_before = f'{activities[-1]["timestamp"]}|{activities[-1]["id"]}'
+
+      return {
+        'logs': activities,
+        'total': total_count,
+        'limit': limit,
+        'offset': offset,
+        'has_more': has_more,
+        'next_before': next_before,
+      }
 
   except Exception as e:
     logger.error(f'Error fetching logs: {str(e)}')
     raise HTTPException(status_code=500, detail=f'Failed to fetch logs: {str(e)}')
-  finally:
-    if 'conn' in locals():
-      return_db_connection(conn)
 
 
 @router.post('/logs/export')
-async def log_export_event(
+def log_export_event(
   analysis_id: int,
   filename: str,
   results_count: int,
-  user_context: Dict[str, Optional[str]] = Depends(get_current_user_context),
+  user_context: UserContext = Depends(get_current_user_context),
 ) -> Dict[str, Any]:
   """Log an export event."""
   try:
-    conn = get_db_connection()
-
-    with conn.cursor() as cursor:
+    with db_cursor() as cursor:
       user_id = get_user_for_logging(user_context)
-      user_email = user_context.get('email', '')
+      user_email = user_context.email or ''
 
       # Log the export event
       cursor.execute(
@@ -253,13 +202,9 @@ async def log_export_event(
       )
 
       log_id = cursor.fetchone()[0]
-      conn.commit()
 
       return {'success': True, 'message': 'Export event logged successfully', 'log_id': log_id}
 
   except Exception as e:
     logger.error(f'Error logging export event: {str(e)}')
     raise HTTPException(status_code=500, detail=f'Failed to log export event: {str(e)}')
-  finally:
-    if 'conn' in locals():
-      return_db_connection(conn)
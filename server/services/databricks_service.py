@@ -1,20 +1,106 @@
 """Databricks integration service for document processing."""
 
-from typing import Any, Dict
+import asyncio
+import functools
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
-from databricks.sdk import WorkspaceClient
+import httpx
+import orjson
 
 from server.config import get_config
 
+if TYPE_CHECKING:
+  from databricks.sdk import WorkspaceClient
+
+
+# Run statuses are reused for this long, which absorbs clients polling /jobs/{id}/status
+JOB_STATUS_TTL_SECONDS = 2
+JOB_STATUS_CACHE_SIZE = 1024
+_job_status_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+_job_status_inflight: Dict[int, asyncio.Future] = {}
+
+
+# Run and task fields of the Jobs API runs/get response kept in job status payloads
+_RUN_FIELDS = (
+  'run_id',
+  'job_id',
+  'run_name',
+  'start_time',
+  'end_time',
+  'run_duration',
+  'setup_duration',
+  'execution_duration',
+  'cleanup_duration',
+  'run_page_url',
+)
+_TASK_FIELDS = ('task_key', 'run_id', 'start_time', 'end_time', 'execution_duration')
+_STATE_FIELDS = ('life_cycle_state', 'result_state', 'state_message')
+
+# Keep-alive connections to the workspace held for Jobs API polling
+JOBS_API_MAX_KEEPALIVE = 20
+JOBS_API_TIMEOUT_SECONDS = 10.0
+_jobs_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _state_info(state: Dict[str, Any]) -> Dict[str, Any]:
+  """Pick the state fields of a run or task."""
+  return {field: state.get(field) for field in _STATE_FIELDS}
+
+
+def _task_info(task: Dict[str, Any]) -> Dict[str, Any]:
+  """Summarize one task of a run; 'state' is only present when Databricks reports one."""
+  task_info = {field: task.get(field) for field in _TASK_FIELDS}
+  if task.get('state'):
+    task_info['state'] = _state_info(task['state'])
+  return task_info
+
+
+@functools.lru_cache(maxsize=1)
+def get_workspace_client() -> 'WorkspaceClient':
+  """Get the process-wide Databricks workspace client.
+
+  Built once and shared, so auth/config resolution and the client's HTTP connection pool
+  are reused across requests instead of being set up per call.
+  """
+  # Imported lazily: the SDK is heavy and not needed until the first Databricks call
+  from databricks.sdk import WorkspaceClient
+
+  # Use environment variables or Databricks CLI authentication
+  return WorkspaceClient()
+
+
+def _get_jobs_http_client() -> httpx.AsyncClient:
+  """Get the process-wide HTTP client used to poll the Jobs API.
+
+  One client keeps its connections to the workspace alive across status polls, and its
+  requests are awaited on the event loop rather than run in worker threads.
+  """
+  global _jobs_http_client
+  if _jobs_http_client is None:
+    _jobs_http_client = httpx.AsyncClient(
+      base_url=get_workspace_client().config.host,
+      limits=httpx.Limits(max_keepalive_connections=JOBS_API_MAX_KEEPALIVE),
+      timeout=JOBS_API_TIMEOUT_SECONDS,
+    )
+  return _jobs_http_client
+
+
+async def close_jobs_http_client() -> None:
+  """Close the Jobs API HTTP client, if it was created."""
+  global _jobs_http_client
+  if _jobs_http_client is not None:
+    await _jobs_http_client.aclose()
+    _jobs_http_client = None
+
 
 class DatabricksService:
   """Service for triggering and monitoring Databricks jobs."""
 
   @staticmethod
-  def _get_client() -> WorkspaceClient:
+  def _get_client() -> 'WorkspaceClient':
     """Get Databricks workspace client."""
-    # Use environment variables or Databricks CLI authentication
-    return WorkspaceClient()
+    return get_workspace_client()
 
   @staticmethod
   def _get_job_id() -> int:
@@ -22,8 +108,20 @@ class DatabricksService:
     return get_config().databricks.job_id
 
   @staticmethod
-  async def trigger_extraction_job(job_id: int, schema_id: int) -> int:
-    """Trigger Databricks notebook for document processing."""
+  async def trigger_extraction_job(
+    job_id: int, schema_id: int, idempotency_token: Optional[str] = None
+  ) -> int:
+    """Trigger Databricks notebook for document processing.
+
+    Args:
+      job_id: Extraction job whose documents should be processed.
+      schema_id: Schema the notebook extracts with.
+      idempotency_token: Reusing a token across retries makes Databricks return the
+        run it already started instead of starting another one.
+
+    Returns:
+      The Databricks run ID.
+    """
     try:
       client = DatabricksService._get_client()
       databricks_job_id = DatabricksService._get_job_id()
@@ -31,8 +129,13 @@ class DatabricksService:
       # Prepare notebook parameters (simplified to match original folio-parse-stream)
       notebook_params = {'job_id': str(job_id), 'schema_id': str(schema_id)}
 
-      # Trigger the job
-      response = client.jobs.run_now(job_id=databricks_job_id, notebook_params=notebook_params)
+      # Trigger the job; the SDK call blocks, so it runs in a worker thread
+      response = await asyncio.to_thread(
+        client.jobs.run_now,
+        job_id=databricks_job_id,
+        notebook_params=notebook_params,
+        idempotency_token=idempotency_token,
+      )
 
       return response.run_id
 
@@ -40,73 +143,75 @@ class DatabricksService:
       raise Exception(f'Failed to trigger Databricks job: {str(e)}')
 
   @staticmethod
-  async def get_job_status(run_id: int) -> Dict[str, Any]:
-    """Get detailed status of a Databricks job run."""
+  async def _fetch_job_status(run_id: int) -> Dict[str, Any]:
+    """Fetch detailed status of a Databricks job run from the Jobs API."""
     try:
-      client = DatabricksService._get_client()
+      # The SDK config resolves (and refreshes) credentials for whichever auth method
+      # the app runs with; a refresh makes an HTTP call, so it runs off the event loop
+      auth_headers = await asyncio.to_thread(get_workspace_client().config.authenticate)
 
       # Get run details
-      run = client.jobs.get_run(run_id=run_id)
+      response = await _get_jobs_http_client().get(
+        '/api/2.1/jobs/runs/get', params={'run_id': run_id}, headers=auth_headers
+      )
+      response.raise_for_status()
+      run = orjson.loads(response.content)
 
       # Extract relevant status information
-      status_info = {
-        'run_id': run.run_id,
-        'job_id': run.job_id,
-        'run_name': run.run_name,
-        'state': {},
-        'start_time': run.start_time,
-        'end_time': run.end_time,
-        'run_duration': run.run_duration,
-        'setup_duration': run.setup_duration,
-        'execution_duration': run.execution_duration,
-        'cleanup_duration': run.cleanup_duration,
-        'run_page_url': run.run_page_url,
-      }
-
-      # Add state information if available
-      if run.state:
-        status_info['state'] = {
-          'life_cycle_state': run.state.life_cycle_state.value
-          if run.state.life_cycle_state
-          else None,
-          'result_state': run.state.result_state.value if run.state.result_state else None,
-          'state_message': run.state.state_message,
-        }
+      status_info = {field: run.get(field) for field in _RUN_FIELDS}
+      status_info['state'] = _state_info(run['state']) if run.get('state') else {}
 
       # Add task information if available
-      if run.tasks:
-        status_info['tasks'] = []
-        for task in run.tasks:
-          task_info = {
-            'task_key': task.task_key,
-            'run_id': task.run_id,
-            'start_time': task.start_time,
-            'end_time': task.end_time,
-            'execution_duration': task.execution_duration,
-          }
-
-          if task.state:
-            task_info['state'] = {
-              'life_cycle_state': task.state.life_cycle_state.value
-              if task.state.life_cycle_state
-              else None,
-              'result_state': task.state.result_state.value if task.state.result_state else None,
-              'state_message': task.state.state_message,
-            }
-
-          status_info['tasks'].append(task_info)
+      if run.get('tasks'):
+        status_info['tasks'] = [_task_info(task) for task in run['tasks']]
 
       return status_info
 
     except Exception as e:
       raise Exception(f'Failed to get Databricks job status: {str(e)}')
 
+  @staticmethod
+  async def get_job_status(run_id: int) -> Dict[str, Any]:
+    """Get detailed status of a Databricks job run.
+
+    Statuses are cached for JOB_STATUS_TTL_SECONDS, and concurrent callers for the same
+    run share one Jobs API call, so clients polling a job don't each reach Databricks.
+    """
+    cached = _job_status_cache.get(run_id)
+    if cached is not None and time.monotonic() - cached[0] < JOB_STATUS_TTL_SECONDS:
+      return cached[1]
+
+    inflight = _job_status_inflight.get(run_id)
+    if inflight is not None:
+      return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _job_status_inflight[run_id] = future
+    try:
+      status_info = await DatabricksService._fetch_job_status(run_id)
+    except Exception as e:
+      future.set_exception(e)
+      # Mark the exception as retrieved in case nobody was waiting
+      future.exception()
+      raise
+    else:
+      now = time.monotonic()
+      if len(_job_status_cache) >= JOB_STATUS_CACHE_SIZE:
+        for key, (fetched_at, _) in list(_job_status_cache.items()):
+          if now - fetched_at >= JOB_STATUS_TTL_SECONDS:
+            del _job_status_cache[key]
+      _job_status_cache[run_id] = (now, status_info)
+      future.set_result(status_info)
+      return status_info
+    finally:
+      del _job_status_inflight[run_id]
+
   @staticmethod
   async def cancel_job(run_id: int) -> bool:
     """Cancel a running Databricks job."""
     try:
       client = DatabricksService._get_client()
-      client.jobs.cancel_run(run_id=run_id)
+      await asyncio.to_thread(client.jobs.cancel_run, run_id=run_id)
       return True
 
     except Exception as e:
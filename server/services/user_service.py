@@ -1,19 +1,49 @@
 """User service for Databricks user operations."""
 
-from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.iam import User
+import functools
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+from urllib.parse import urlsplit
+
+from server.services.databricks_service import get_workspace_client
+
+if TYPE_CHECKING:
+  from databricks.sdk.service.iam import User
+
+
+# The shared workspace client always authenticates as the same identity, so its
+# current-user lookup is reused process-wide for this long
+CURRENT_USER_TTL_SECONDS = 300
+_current_user_cache: Optional[Tuple[float, 'User']] = None
+
+
+@functools.lru_cache(maxsize=1)
+def _deployment_name(workspace_url: Optional[str]) -> Optional[str]:
+  """Get the deployment name (first host label) of the workspace URL.
+
+  The host is fixed for the process, so this is parsed once.
+  """
+  hostname = urlsplit(workspace_url).hostname if workspace_url else None
+  return hostname.split('.', 1)[0] if hostname else None
 
 
 class UserService:
   """Service for managing Databricks user operations."""
 
   def __init__(self):
-    """Initialize the user service with Databricks workspace client."""
-    self.client = WorkspaceClient()
+    """Initialize the user service with the shared Databricks workspace client."""
+    self.client = get_workspace_client()
+
+  def get_current_user(self) -> 'User':
+    """Get the current authenticated user, cached for CURRENT_USER_TTL_SECONDS."""
+    global _current_user_cache
+    cached = _current_user_cache
+    if cached is not None and time.monotonic() - cached[0] < CURRENT_USER_TTL_SECONDS:
+      return cached[1]
 
-  def get_current_user(self) -> User:
-    """Get the current authenticated user."""
-    return self.client.current_user.me()
+    user = self.client.current_user.me()
+    _current_user_cache = (time.monotonic(), user)
+    return user
 
   def get_user_info(self) -> dict:
     """Get formatted user information for display."""
@@ -39,6 +69,6 @@ class UserService:
       },
       'workspace': {
         'url': workspace_url,
-        'deployment_name': workspace_url.split('//')[1].split('.')[0] if workspace_url else None,
+        'deployment_name': _deployment_name(workspace_url),
       },
     }